@@ -0,0 +1,136 @@
+import argparse, json, shutil, subprocess, sys, tempfile, time
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+# Benchmark for dash-all-search.py: synthesizes dashboard.csv + meta/ trees of
+# several sizes, runs the full build on each and reports per-stage wall time,
+# peak RSS and output size (from the generator's --report file).
+
+parser = argparse.ArgumentParser(description="Benchmark the explorer.html build on synthetic corpora")
+parser.add_argument("--sizes", default="10000,100000,1000000", help="Comma-separated paper counts")
+parser.add_argument("--workdir", help="Where synthetic corpora are written (default: a temporary directory)")
+parser.add_argument("--keep", action="store_true", help="Keep the synthetic corpora after the run")
+parser.add_argument("--seed", type=int, default=0)
+parser.add_argument("--report", help="Also write all results to this JSON file")
+parser.add_argument("build_args", nargs=argparse.REMAINDER, help="Extra arguments passed to dash-all-search.py (after --)")
+args = parser.parse_args()
+
+script = Path(__file__).resolve().parent / "dash-all-search.py"
+
+vocab = np.array(("traffic flow model calibration network demand transit safety vehicle signal route choice "
+                  "autonomous freight logistics emissions congestion pricing ride hailing bicycle pedestrian "
+                  "crash severity travel time reliability simulation optimization data survey behaviour "
+                  "mode accessibility equity electric charging infrastructure policy urban rail bus").split())
+topic_names = np.array([f"Topic {i:02d}" for i in range(24)] + ["Travel behaviour"])
+journals = np.array([f"Transportation Research Part {c}" for c in "ABCDEF"]
+                    + ["Transport Policy", "Journal of Transport Geography", "Transportation Science",
+                       "Travel Behaviour and Society", "Accident Analysis & Prevention", "Transportation"])
+hosts = np.array(["https://github.com/", "github.com/", "https://gitlab.com/", "https://zenodo.org/records/",
+                  "https://doi.org/10.5281/zenodo.", "https://osf.io/", "https://figshare.com/articles/"])
+
+def zipf_choice(rng, values, n, a=1.1):
+    """Skewed categorical draw: the i-th value has weight 1 / (i + 1) ** a"""
+    w = 1.0 / np.arange(1, len(values) + 1) ** a
+    return values[rng.choice(len(values), size=n, p=w / w.sum())]
+
+def link_lists(rng, available):
+    """code_link-style cells: '[]' when unavailable, list literals (some without scheme or malformed) otherwise"""
+    cells = np.full(len(available), "[]", dtype=object)
+    idx = np.flatnonzero(available)
+    n_links = rng.choice([1, 1, 1, 2, 3], size=len(idx))
+    host = rng.integers(0, len(hosts), size=(len(idx), 3))
+    repo = rng.integers(0, 10 ** 6, size=(len(idx), 3))
+    malformed = rng.random(len(idx)) < 0.03
+    for j, i in enumerate(idx):
+        urls = [f"{hosts[host[j, k]]}r{repo[j, k]}" for k in range(n_links[j])]
+        cells[i] = f"see {urls[0]} and paper" if malformed[j] else repr(urls)
+    return cells
+
+def synthesize(n, root, rng):
+    """Write root/data/dashboard.csv and root/meta/*.json for n papers"""
+    (root / "data").mkdir(parents=True, exist_ok=True)
+    meta_dir = root / "meta"
+    meta_dir.mkdir(exist_ok=True)
+
+    doi = np.char.add("10.1016/j.tr.", np.arange(n).astype(str)).astype(object)
+    dup = rng.random(n) < 0.01  # a few papers listed twice
+    doi[dup] = doi[rng.integers(0, n, size=dup.sum())]
+    topic = zipf_choice(rng, topic_names, n).astype(object)
+    topic[rng.random(n) < 0.02] = None
+    centers = {t: rng.normal(0, 40, size=2) for t in topic_names}
+    cx = np.array([centers[t][0] if t else 0.0 for t in topic])
+    cy = np.array([centers[t][1] if t else 0.0 for t in topic])
+    code = rng.random(n) < 0.15
+    data = rng.choice(np.array([True, False, None], dtype=object), size=n, p=[0.1, 0.7, 0.2])
+    df = pd.DataFrame({
+        "doi": doi,
+        "doi_url": np.char.add("https://doi.org/", doi.astype(str)),
+        "year": rng.choice(np.arange(2000, 2025), size=n, p=np.linspace(1, 6, 25) / np.linspace(1, 6, 25).sum()),
+        "journal": zipf_choice(rng, journals, n, a=0.8),
+        "lda_topic": topic,
+        "tsne_x": cx + rng.normal(0, 8, size=n),
+        "tsne_y": cy + rng.normal(0, 8, size=n),
+        "is_code_publicly_available": code,
+        "is_data_repository_available": data,
+        "code_link": link_lists(rng, code),
+        "links_to_the_data_repository": link_lists(rng, data == True),
+        "llm_notes": "unused column",
+    })
+    df.to_csv(root / "data" / "dashboard.csv", index=False)
+
+    # ~8% of papers have no metadata file; the rest have lognormal abstract lengths and optional fields
+    unique_doi = pd.unique(doi)
+    has_meta = rng.random(len(unique_doi)) >= 0.08
+    words = rng.integers(0, len(vocab), size=(len(unique_doi), 8))
+    abstract_len = np.clip(rng.lognormal(5.1, 0.4, size=len(unique_doi)).astype(int), 20, 600)
+    for i, d in enumerate(unique_doi):
+        if not has_meta[i]:
+            continue
+        meta = {
+            "title": " ".join(vocab[words[i]]).title(),
+            "abstract": " ".join(vocab[rng.integers(0, len(vocab), size=abstract_len[i])]),
+            "primary_institution": f"University {i % 500}",
+            "keywords": list(vocab[words[i, :4]]),
+            "funding_agencies": ["National Science Foundation"] if i % 3 else [],
+            "acknowledgement": "We thank the reviewers." if i % 4 else "",
+            "open_access": bool(i % 2),
+        }
+        if i % 17 == 0:
+            del meta["abstract"]
+        (meta_dir / (d.replace("/", "_") + ".json")).write_text(json.dumps(meta), encoding="utf-8")
+
+def run_build(root):
+    """Full (uncached) build of root's corpus; returns the generator's build report plus totals"""
+    report = root / "report.json"
+    cmd = [sys.executable, str(script), "--csv", str(root / "data" / "dashboard.csv"), "--meta-dir", str(root / "meta"),
+           "--out", str(root / "explorer.html"), "--cache-dir", str(root / ".build_cache"), "--no-cache",
+           "--report", str(report)] + [a for a in args.build_args if a != "--"]
+    start = time.perf_counter()
+    subprocess.run(cmd, cwd=root, check=True, stdout=subprocess.DEVNULL)
+    result = json.loads(report.read_text(encoding="utf-8"))
+    result["total_wall_s"] = round(time.perf_counter() - start, 3)
+    result["html_bytes"] = (root / "explorer.html").stat().st_size
+    return result
+
+workdir = Path(args.workdir) if args.workdir else Path(tempfile.mkdtemp(prefix="otsm-bench-"))
+results = {}
+for n in [int(x) for x in args.sizes.split(",") if x.strip()]:
+    root = workdir / f"n{n}"
+    start = time.perf_counter()
+    synthesize(n, root, np.random.default_rng(args.seed))
+    print(f"\n== {n} papers (synthesized in {time.perf_counter() - start:.1f}s)")
+    result = run_build(root)
+    results[n] = result
+    print(f"{'stage':<16}{'wall s':>10}{'cpu s':>10}{'peak RSS MB':>14}{'output bytes':>16}")
+    for st in result["stages"]:
+        out = "" if st["output_bytes"] is None else f"{st['output_bytes']:,}"
+        print(f"{st['stage']:<16}{st['wall_s']:>10.3f}{st['cpu_s']:>10.3f}{st['peak_rss_mb'] or 0:>14.1f}{out:>16}")
+    print(f"{'total':<16}{result['total_wall_s']:>10.3f}{result['cpu_s']:>10.3f}{result['peak_rss_mb'] or 0:>14.1f}{result['html_bytes']:>16,}")
+    if not args.keep:
+        shutil.rmtree(root)
+
+if args.report:
+    Path(args.report).write_text(json.dumps(results, indent=2), encoding="utf-8")
+if not args.keep and not args.workdir:
+    shutil.rmtree(workdir, ignore_errors=True)
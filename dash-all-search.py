@@ -1,15 +1,282 @@
-import pandas as pd, ast, json, numpy as np, os, re
+import pandas as pd, ast, json, numpy as np, os, re, sys
+import argparse, hashlib, mmap, time, cProfile, tracemalloc, gzip, base64, functools, multiprocessing
+import asyncio, bisect, threading
+from collections import Counter, OrderedDict
+from html import escape as html_escape
+from urllib.parse import parse_qs, unquote, urlsplit
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 import matplotlib
 import matplotlib.pyplot as plt
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+try:
+    import pyarrow  # optional: pyarrow CSV engine and Feather snapshots
+except ImportError:
+    pyarrow = None
+try:
+    from scipy.spatial import cKDTree  # optional: KD-tree for similar papers
+except ImportError:
+    cKDTree = None
 
-csv_path = "data/dashboard.csv"
-df = pd.read_csv(csv_path)
+parser = argparse.ArgumentParser(description="Build explorer.html from data/dashboard.csv and meta/*.json")
+parser.add_argument("--csv", default="data/dashboard.csv", help="Input dashboard CSV")
+parser.add_argument("--meta-dir", default="meta", help="Directory of per-DOI metadata JSON files")
+parser.add_argument("--out", default="explorer.html", help="Output HTML file")
+parser.add_argument("--cache-dir", default=".build_cache", help="Persistent build cache directory")
+parser.add_argument("--no-cache", action="store_true", help="Rebuild everything and leave the build cache untouched")
+parser.add_argument("--csv-engine", choices=["c", "pyarrow"], default="c", help="pandas CSV parser engine (pyarrow is multithreaded)")
+parser.add_argument("--patches", help="JSON patch file (relabels, per-DOI overrides, exclusions) applied after loading the CSV (default: data/patches.json if present)")
+parser.add_argument("--low-memory", "--stream", dest="low_memory", action="store_true",
+                    help="Lower (not bound) peak memory: load metadata in blocks and write the page payloads straight to the output file; --stream is the old name")
+parser.add_argument("--chunk-rows", type=int, default=50000, help="Rows per metadata block for --low-memory")
+parser.add_argument("--workers", type=int, default=min(32, (os.cpu_count() or 1) + 4), help="Threads used to read metadata files (1 = serial)")
+parser.add_argument("--processes", type=int, default=1,
+                    help="Worker processes for per-paper preprocessing (links, metadata, search index); 0 = one per CPU")
+parser.add_argument("--meta-pack", help="Read metadata from a packed JSONL store instead of --meta-dir")
+parser.add_argument("--pack-meta", action="store_true", help="(Re)write the metadata pack from --meta-dir before building (default pack: data/meta.jsonl)")
+parser.add_argument("--lazy-details", action="store_true", help="Write abstracts, keywords, funding and acknowledgements to sharded files fetched on click")
+parser.add_argument("--detail-shards", type=int, default=256, help="Number of detail shard files for --lazy-details")
+parser.add_argument("--binary", action="store_true",
+                    help="Encode coordinates and ids as base64 typed arrays and repetitive paper fields as dictionary codes")
+parser.add_argument("--tiles", action="store_true", help="Write points and the paper table to quadtree tile files loaded for the current viewport")
+parser.add_argument("--tile-points", type=int, default=20000, help="Maximum papers per quadtree tile for --tiles")
+parser.add_argument("--tile-cache", type=int, default=64, help="Tiles the page keeps in memory (least recently used are dropped) for --tiles")
+parser.add_argument("--serve", type=int, metavar="PORT",
+                    help="After building, serve the page and a query API over the paper table on this port; the page then fetches points from it")
+parser.add_argument("--host", default="127.0.0.1", help="Interface the --serve server listens on")
+parser.add_argument("--page-size", type=int, default=20000, help="Most points the query server returns per request for --serve")
+parser.add_argument("--query-cache", type=int, default=256, help="Query results the --serve server keeps (least recently used are dropped)")
+parser.add_argument("--report", help="Write a JSON build report: wall/CPU time, peak memory delta, rows and output size per stage")
+parser.add_argument("--trace-memory", action="store_true", help="Also record per-stage peak Python allocations with tracemalloc (slows the build)")
+parser.add_argument("--profile", help="Dump cProfile stats for the whole build to this file")
+parser.add_argument("--size-report", help="Write a raw/gzip size breakdown of the page payload by field and by trace to this JSON file")
+parser.add_argument("--size-budget", action="append", default=[], metavar="KEY=SIZE",
+                    help="Fail the build when a size-report entry exceeds SIZE bytes (k/M suffixes ok), e.g. html.gz=2M or papers.abstract=800k; repeatable")
+parser.add_argument("--lod-points", type=int, default=200000,
+                    help="For corpora larger than this, show a density grid while more than this many points are in view (0 = always draw points)")
+parser.add_argument("--lod-grid", type=int, default=256, help="Cells per axis of the finest density grid level (a power of two)")
+parser.add_argument("--similar", type=int, default=5, help="Nearest neighbours listed as similar papers in the detail view (0 = off)")
+parser.add_argument("--similar-filter", choices=["any", "code", "data"], default="code",
+                    help="Only suggest papers with code (or data) available, or any paper")
+parser.add_argument("--embedding-column", help="CSV column of vector list literals used for similar papers instead of the t-SNE coordinates")
+parser.add_argument("--index-fields", default="abstract", help="Comma-separated paper fields tokenized into the search index, e.g. abstract,title,keywords")
+args = parser.parse_args()
 
-# Ensure booleans
-df['is_code_publicly_available'] = df['is_code_publicly_available'].astype(bool)
-pd.set_option('future.no_silent_downcasting', True)
-df['is_data_repository_available'] = df['is_data_repository_available'].fillna(False).infer_objects(copy=False).astype(bool)
+csv_path = args.csv
+meta_dir = Path(args.meta_dir)
+cache_dir = Path(args.cache_dir)
+use_cache = not args.no_cache
+patches_path = Path(args.patches) if args.patches else Path("data/patches.json")
+if args.patches and not patches_path.exists():
+    raise SystemExit(f"--patches: {patches_path} does not exist")
+meta_pack_path = Path(args.meta_pack or "data/meta.jsonl") if (args.meta_pack or args.pack_meta) else None
+if args.serve is not None and args.tiles:
+    raise SystemExit("--serve and --tiles are alternatives; pick one")
+if args.low_memory and (args.size_report or args.size_budget):
+    # The breakdown needs every payload serialized in memory, which --low-memory avoids
+    raise SystemExit("--size-report/--size-budget cannot be combined with --low-memory")
+
+# meta_* columns extracted from the metadata files: column -> (metadata key, default)
+meta_fields = {
+    "meta_title": ("title", ""),
+    "meta_abstract": ("abstract", ""),
+    "meta_inst": ("primary_institution", ""),
+    "meta_keywords": ("keywords", ""),
+    "meta_funding": ("funding_agencies", ""),
+    "meta_ack": ("acknowledgement", ""),
+    "meta_open_access": ("open_access", "False"),
+}
+
+# Shared paper table: one record per CSV row, referenced from traces by row position.
+# Fields come from CSV-derived work columns (field -> column), then one per meta_* column.
+csv_fields = {"doi_url": "doi_url", "year": "year", "journal": "journal", "code": "code_disp", "data": "data_disp"}
+paper_fields = [*csv_fields, *(col.removeprefix("meta_") for col in meta_fields)]
+
+index_fields = [f.strip() for f in args.index_fields.split(",") if f.strip()]
+if unknown := [f for f in index_fields if f not in paper_fields]:
+    raise SystemExit(f"--index-fields: unknown field(s) {', '.join(unknown)}; valid fields are {', '.join(paper_fields)}")
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return round(rss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+# Build stages are delimited by end_stage() calls; each records what happened
+# since the previous one. peak_rss_delta_mb is how far the stage raised the
+# process's peak RSS.
+profiler = cProfile.Profile() if args.profile else None
+if profiler:
+    profiler.enable()
+if args.trace_memory:
+    tracemalloc.start()
+build_started = time.strftime("%Y-%m-%dT%H:%M:%S%z")
+stage_log = []
+stage_start = build_start = time.perf_counter()
+stage_cpu = build_cpu = time.process_time()
+stage_rss = peak_rss_mb()
+
+def end_stage(name, rows=None, output_bytes=None):
+    """Close the build stage that began at the previous end_stage() call"""
+    global stage_start, stage_cpu, stage_rss
+    now, cpu, rss = time.perf_counter(), time.process_time(), peak_rss_mb()
+    entry = {
+        "stage": name,
+        "wall_s": round(now - stage_start, 4),
+        "cpu_s": round(cpu - stage_cpu, 4),
+        "peak_rss_mb": rss,
+        "peak_rss_delta_mb": None if rss is None else round(rss - stage_rss, 1),
+        "rows": rows,
+        "output_bytes": output_bytes,
+    }
+    if tracemalloc.is_tracing():
+        current, peak = tracemalloc.get_traced_memory()
+        entry["py_peak_delta_mb"] = round((peak - stage_log[-1]["py_current_b"] if stage_log else peak) / 2**20, 1)
+        entry["py_current_b"] = current
+        tracemalloc.reset_peak()
+    stage_log.append(entry)
+    stage_start, stage_cpu, stage_rss = now, cpu, rss
+
+build_salt = "|".join([hashlib.sha1(Path(__file__).read_bytes()).hexdigest(), pd.__version__, np.__version__])
+
+# Declared CSV schema: only the columns the explorer uses. None = inferred,
+# the availability flags keep their inferred values for the conversions below.
+csv_schema = {
+    "doi": "str",
+    "doi_url": "str",
+    "year": "category",
+    "journal": "category",
+    "lda_topic": "category",
+    "tsne_x": "float64",
+    "tsne_y": "float64",
+    "is_code_publicly_available": None,
+    "is_data_repository_available": None,
+    "code_link": "str",
+    "links_to_the_data_repository": "str",
+}
+if args.embedding_column:
+    csv_schema[args.embedding_column] = "str"
+
+def read_dashboard(path):
+    """Read the CSV columns in csv_schema with their declared dtypes, then normalize the flags"""
+    if args.csv_engine == "pyarrow" and pyarrow is None:
+        raise SystemExit("--csv-engine pyarrow needs the pyarrow package")
+    read_args = dict(usecols=list(csv_schema), engine=args.csv_engine, dtype={col: dtype for col, dtype in csv_schema.items() if dtype})
+    frame = pd.read_csv(path, **read_args)
+    frame = frame[list(csv_schema)]
+    # Ensure booleans
+    frame['is_code_publicly_available'] = frame['is_code_publicly_available'].astype(bool)
+    frame['is_data_repository_available'] = frame['is_data_repository_available'].astype(object).fillna(False).astype(bool)
+    return frame
+
+def file_sha1(path, block_size=1 << 20):
+    """SHA-1 of a file, read in blocks rather than all at once"""
+    digest = hashlib.sha1()
+    with open(path, "rb") as fh:
+        while block := fh.read(block_size):
+            digest.update(block)
+    return digest.hexdigest()
+
+# Cleaned-frame snapshot (Feather with pyarrow, else pickle), reused while the
+# CSV bytes and this script are unchanged. The key file also records the CSV's
+# [mtime_ns, size] and hash, so like scan_meta_dir() the CSV is only re-hashed
+# when its stat changed.
+snapshot_path = cache_dir / ("csv_snapshot.feather" if pyarrow is not None else "csv_snapshot.pkl")
+snapshot_key_path = cache_dir / "csv_snapshot.key"
+snapshot_info = {}
+if use_cache and snapshot_key_path.exists():
+    try:
+        snapshot_info = json.loads(snapshot_key_path.read_text())
+    except ValueError:
+        pass
+    if not isinstance(snapshot_info, dict):
+        snapshot_info = {}
+csv_stat = os.stat(csv_path)
+csv_stat = [csv_stat.st_mtime_ns, csv_stat.st_size]
+csv_sha1 = snapshot_info["csv_sha1"] if snapshot_info.get("stat") == csv_stat else file_sha1(csv_path)
+snapshot_key = hashlib.sha1((csv_sha1 + build_salt + args.csv_engine + ",".join(csv_schema)).encode("utf-8")).hexdigest()
+df = None
+if use_cache and snapshot_path.exists() and snapshot_info.get("key") == snapshot_key:
+    try:
+        df = pd.read_feather(snapshot_path) if pyarrow is not None else pd.read_pickle(snapshot_path)
+        row_hash = df.pop("_row_hash").to_numpy()
+    except Exception:
+        df = None
+if df is None:
+    df = read_dashboard(csv_path)
+    # Content hash of every CSV row (vectorized), used to key the build cache
+    row_hash = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    if use_cache:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        snapshot = df.assign(_row_hash=row_hash)
+        snapshot.to_feather(snapshot_path) if pyarrow is not None else snapshot.to_pickle(snapshot_path)
+if use_cache and snapshot_info != {"stat": csv_stat, "csv_sha1": csv_sha1, "key": snapshot_key}:
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    snapshot_key_path.write_text(json.dumps({"stat": csv_stat, "csv_sha1": csv_sha1, "key": snapshot_key}))
+end_stage("csv_load", rows=len(df))
+
+# Data fixes are declared in a patch file instead of rewriting the CSV:
+#   {"relabel": {"lda_topic": {"Traffic behaviour": "Travel behaviour"}},
+#    "overrides": {"<doi>": {"journal": "...", "year": 2021}},
+#    "exclude": ["<doi>", ...]}
+# Patched rows are re-hashed, so only they miss the build cache.
+def patch_column(col, mask, values):
+    """Copy of col with values written at mask; categoricals gain any new categories"""
+    values = pd.Series(values, index=col.index[mask], dtype=object)
+    if isinstance(col.dtype, pd.CategoricalDtype):
+        values = values.astype(col.cat.categories.dtype)
+        new = values[~values.isin(col.cat.categories)].unique()
+        col = col.cat.add_categories(new) if len(new) else col.copy()
+    else:
+        values = values.astype(col.dtype)
+        col = col.copy()
+    col[mask] = values
+    return col
+
+def apply_patches(frame, hashes, patches):
+    """Apply relabel/override/exclude patches; returns the patched frame and its row hashes"""
+    unknown = set(patches) - {"relabel", "overrides", "exclude"}
+    if unknown:
+        raise SystemExit(f"{patches_path}: unknown patch sections {sorted(unknown)}")
+    touched = np.zeros(len(frame), dtype=bool)
+    for col, mapping in patches.get("relabel", {}).items():
+        if col not in frame:
+            raise SystemExit(f"{patches_path}: cannot relabel unknown column {col!r}")
+        hit = frame[col].isin(list(mapping)).to_numpy()
+        frame[col] = patch_column(frame[col], hit, frame[col][hit].astype(object).map(mapping).to_numpy())
+        touched |= hit
+    overrides = pd.DataFrame.from_dict(patches.get("overrides", {}), orient="index")
+    pos = overrides.index.get_indexer(frame["doi"])  # -1: no override for this row
+    for col in overrides.columns:
+        if col not in frame or col == "doi":
+            raise SystemExit(f"{patches_path}: cannot override column {col!r}")
+        values = overrides[col].to_numpy(dtype=object)
+        hit = (pos >= 0) & overrides[col].notna().to_numpy()[pos]
+        frame[col] = patch_column(frame[col], hit, values[pos[hit]])
+        touched |= hit
+    if touched.any():
+        hashes = hashes.copy()
+        hashes[touched] = pd.util.hash_pandas_object(frame[touched], index=False).to_numpy()
+    keep = ~frame["doi"].isin(patches.get("exclude", [])).to_numpy()
+    print(f"patches: {touched.sum()} rows changed, {(~keep).sum()} excluded")
+    return frame[keep].reset_index(drop=True), hashes[keep]
+
+if args.patches or patches_path.exists():
+    df, row_hash = apply_patches(df, row_hash, json.loads(patches_path.read_text(encoding="utf-8")))
+    end_stage("patches", rows=len(df))
+
+# Most link cells are lists of plain quoted strings, which are split with a
+# regex; anything else (escapes, non-string items, malformed text) goes
+# through literal_eval as before. The fast path only matches what literal_eval
+# reads the same way: no line breaks, \v, \f or NUL inside items and only
+# spaces/tabs between tokens.
+quoted_list_re = re.compile(r"""\[[ \t]*(?:(?:'[^'\\\n\r\v\f\0]*'|"[^"\\\n\r\v\f\0]*")[ \t]*,[ \t]*)*"""
+                            r"""(?:'[^'\\\n\r\v\f\0]*'|"[^"\\\n\r\v\f\0]*")?[ \t]*\]""")
+quoted_item_re = re.compile(r"'([^'\\\n\r\v\f\0]*)'" r'|"([^"\\\n\r\v\f\0]*)"')
 
 def parse_list_str(x):
     if pd.isna(x):
@@ -19,6 +286,8 @@ def parse_list_str(x):
     s = str(x).strip()
     if s in ("[]", "", "nan", "None", "null"):
         return []
+    if quoted_list_re.fullmatch(s):
+        return [a or b for a, b in quoted_item_re.findall(s) if (a or b).strip()]
     try:
         v = ast.literal_eval(s)
         if isinstance(v, list):
@@ -40,47 +309,137 @@ def ensure_https(urls):
         result.append(url)
     return result
 
-df['code_links'] = df['code_link'].apply(parse_list_str).apply(ensure_https)
-df['data_links'] = df['links_to_the_data_repository'].apply(parse_list_str).apply(ensure_https)
+# Per-paper preprocessing can be sharded over worker processes. They are forked,
+# so they inherit the loaded frame and metadata index instead of re-running the
+# script; where fork is unavailable the build stays serial.
+n_processes = args.processes or os.cpu_count() or 1
+fork_context = multiprocessing.get_context("fork") if "fork" in multiprocessing.get_all_start_methods() else None
+if n_processes > 1 and fork_context is None:
+    print("--processes needs the fork start method, preprocessing serially")
+    n_processes = 1
+
+def map_shards(fn, n_rows, shard_rows=None):
+    """fn(start, stop) over consecutive row ranges, in the process pool when enabled; results come back in row order"""
+    shard_rows = shard_rows or max(1, -(-n_rows // (n_processes * 4)))
+    bounds = [(start, min(start + shard_rows, n_rows)) for start in range(0, n_rows, shard_rows)] or [(0, 0)]
+    if n_processes <= 1 or len(bounds) <= 1:
+        return [fn(start, stop) for start, stop in bounds]
+    with ProcessPoolExecutor(max_workers=n_processes, mp_context=fork_context) as ex:
+        return list(ex.map(fn, *zip(*bounds)))
+
+def meta_filename(doi):
+    """Metadata file name for a DOI (/ replaced with _)"""
+    return doi.replace('/', '_') + '.json'
+
+# Build cache: one preprocessed paper-table record per CSV row, keyed by a hash
+# of the row and the metadata file its DOI points to. The manifest remembers
+# (mtime_ns, size, sha1) per metadata file. Scanning only stats the files:
+# rows whose file changed stat are rebuilt, and the file's sha1 is taken from
+# the bytes read while loading it, so no file is read twice.
+manifest_path = cache_dir / "manifest.json"
+papers_cache_path = cache_dir / "papers.json"
+manifest = {}
+if use_cache and manifest_path.exists():
+    try:
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    except Exception:
+        manifest = {}
+
+def scan_meta_dir(previous):
+    """Map metadata filename -> [mtime_ns, size, sha1]; sha1 is None for files whose stat changed"""
+    entries = {}
+    if not meta_dir.is_dir():
+        return entries
+    with os.scandir(meta_dir) as it:
+        for entry in it:
+            if not entry.name.endswith('.json'):
+                continue
+            st = entry.stat()
+            old = previous.get(entry.name)
+            if old and old[0] == st.st_mtime_ns and old[1] == st.st_size:
+                entries[entry.name] = old
+            else:
+                entries[entry.name] = [st.st_mtime_ns, st.st_size, None]
+    return entries
+
+def pack_index_path(pack_path):
+    return pack_path.with_name(pack_path.name + ".idx.json")
+
+def pack_meta(pack_path):
+    """Merge meta/*.json into one JSONL file plus an index of filename -> [offset, length, sha1]"""
+    names = sorted(n for n in os.listdir(meta_dir) if n.endswith('.json'))
+    index = {}
+    offset = 0
+    tmp_path = pack_path.with_name(pack_path.name + ".tmp")
+    with ThreadPoolExecutor(max_workers=max(args.workers, 1)) as ex, open(tmp_path, 'wb') as f:
+        for name, raw in zip(names, ex.map(lambda n: (meta_dir / n).read_bytes(), names)):
+            try:
+                line = json.dumps(json.loads(raw), ensure_ascii=False).encode('utf-8') + b"\n"
+            except ValueError:
+                # unreadable files behave like missing ones, as in load_meta
+                continue
+            f.write(line)
+            index[name] = [offset, len(line), hashlib.sha1(raw).hexdigest()]
+            offset += len(line)
+    tmp_path.replace(pack_path)
+    pack_index_path(pack_path).write_text(json.dumps(index), encoding="utf-8")
+    print(f"packed {len(index)} metadata files into {pack_path}")
+
+# Pack entries carry the sha1 of the original file, so switching between the
+# pack and meta/ does not invalidate the build cache.
+if args.pack_meta:
+    pack_meta(meta_pack_path)
+if meta_pack_path:
+    meta_files = json.loads(pack_index_path(meta_pack_path).read_text(encoding="utf-8"))
+else:
+    meta_files = scan_meta_dir(manifest.get("meta", {}))
+
+def meta_digest(doi):
+    if pd.isna(doi):
+        return ""
+    entry = meta_files.get(meta_filename(doi))
+    return entry[2] if entry else ""
+
+def row_keys(digests):
+    """Cache key of every row: its content hash combined with its metadata file's sha1"""
+    return pd.util.hash_pandas_object(
+        pd.DataFrame({"row": row_hash, "meta": df['doi'].map(digests).values}), index=False
+    ).values
+
+doi_digest = {doi: meta_digest(doi) for doi in df['doi'].unique()}
+row_key = row_keys(doi_digest)
+# DOIs whose metadata file changed stat: their rows are rebuilt whatever the cache holds
+changed_dois = [doi for doi, digest in doi_digest.items() if digest is None]
+meta_changed = df['doi'].isin(changed_dois).to_numpy()
 
 # Load metadata from JSON files
 def load_meta(doi):
+    """(metadata, sha1 of the file's bytes) for a DOI; ({}, "") without a file"""
     if pd.isna(doi):
-        return {}
+        return {}, ""
+    filename = meta_filename(doi)
+    if filename not in meta_files:
+        return {}, ""
     try:
-        # Replace / with _ for filename
-        filename = doi.replace('/', '_') + '.json'
-        path = Path('meta') / filename
-        if path.exists():
-            with open(path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-    except Exception:
-        pass
-    return {}
-
-# Pre-load metadata to avoid repeated IO
-meta_cache = {}
-for doi in df['doi'].unique():
-    meta_cache[doi] = load_meta(doi)
-
-def get_meta_field(doi, field, default=""):
-    data = meta_cache.get(doi, {})
-    val = data.get(field, default)
-    if isinstance(val, list):
-        return ", ".join(val)
-    return str(val)
-
-df['meta_title'] = df['doi'].apply(lambda x: get_meta_field(x, 'title', ''))
-df['meta_abstract'] = df['doi'].apply(lambda x: get_meta_field(x, 'abstract', ''))
-df['meta_inst'] = df['doi'].apply(lambda x: get_meta_field(x, 'primary_institution', ''))
-df['meta_keywords'] = df['doi'].apply(lambda x: get_meta_field(x, 'keywords', ''))
-df['meta_funding'] = df['doi'].apply(lambda x: get_meta_field(x, 'funding_agencies', ''))
-df['meta_ack'] = df['doi'].apply(lambda x: get_meta_field(x, 'acknowledgement', ''))
-df['meta_open_access'] = df['doi'].apply(lambda x: get_meta_field(x, 'open_access', 'False'))
+        raw = (meta_dir / filename).read_bytes()
+    except OSError:
+        return {}, ""
+    digest = hashlib.sha1(raw).hexdigest()
+    try:
+        return json.loads(raw), digest
+    except ValueError:
+        return {}, digest
 
 # Topic column
 topic_col = 'lda_topic'
-topics = sorted(df[topic_col].fillna("Unknown").unique().tolist())
+def fill_unknown(col):
+    """fillna("Unknown") that also works on categorical columns"""
+    if isinstance(col.dtype, pd.CategoricalDtype) and "Unknown" not in col.cat.categories:
+        col = col.cat.add_categories(["Unknown"])
+    return col.fillna("Unknown")
+
+topic_values = fill_unknown(df[topic_col])
+topics = sorted(topic_values.unique().tolist())
 
 # Color palette (modern colormaps API; sample N distinct colors)
 n_colors = max(len(topics), 1)
@@ -93,64 +452,248 @@ def rgba_from_cmap(i, a=1.0):
 
 topic_color = {t: rgba_from_cmap(i, 1.0) for i,t in enumerate(topics)}
 
-def safe_str(x):
-    return "" if pd.isna(x) else str(x)
+views = [("code", "is_code_publicly_available"), ("data", "is_data_repository_available")]
+
+# Only rows without a cached record (new or changed papers) are preprocessed
+cached_papers = {}
+if use_cache and papers_cache_path.exists():
+    try:
+        cache = json.loads(papers_cache_path.read_text(encoding="utf-8"))
+        if cache.get("salt") == build_salt and cache.get("fields") == paper_fields:
+            cached_papers = {int(k): v for k, v in cache["rows"].items()}
+    except Exception:
+        cached_papers = {}
+dirty = ~np.isin(row_key, np.fromiter(cached_papers, dtype=np.uint64, count=len(cached_papers))) | meta_changed
+
+work = df[dirty].copy()
+print(f"{len(work)} of {len(df)} rows need rebuilding")
+end_stage("cache_check", rows=len(work))
+
+def link_disp(links):
+    if not links:
+        return "No link found"
+    anchors = [f"<a href='{u}' target='_blank' rel='noopener noreferrer'>{u}</a>" for u in links[:3]]
+    return "<br>".join(anchors)
+
+def parse_link_column(col):
+    """URL lists and anchor HTML for a link-list column; each distinct raw cell is parsed once"""
+    codes, uniques = pd.factorize(col)
+    links = np.empty(len(uniques) + 1, dtype=object)
+    for i, raw in enumerate(uniques):
+        links[i] = ensure_https(parse_list_str(raw))
+    links[-1] = []  # missing cells have code -1
+    disp = np.array([link_disp(l) for l in links], dtype=object)
+    return links[codes], disp[codes]
+
+
+def load_metas(dois):
+    """(metadata, sha1) for many DOIs: slices of one mapped pack file, or a thread pool over meta/*.json"""
+    if meta_pack_path:
+        result = {doi: ({}, meta_digest(doi)) for doi in dois}
+        if not meta_pack_path.stat().st_size:
+            return result
+        with open(meta_pack_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as blob:
+            for doi in dois:
+                entry = None if pd.isna(doi) else meta_files.get(meta_filename(doi))
+                if entry:
+                    result[doi] = (json.loads(blob[entry[0]:entry[0] + entry[1]]), entry[2])
+        return result
+    if args.workers <= 1:
+        return {doi: load_meta(doi) for doi in dois}
+    with ThreadPoolExecutor(max_workers=args.workers) as ex:
+        return dict(zip(dois, ex.map(load_meta, dois)))
+
+def extract_meta_fields(dois, metas):
+    """All meta_* columns in one pass; rows sharing a DOI reuse its extracted values"""
+    codes, uniques = pd.factorize(dois)
+    values = np.empty((len(uniques) + 1, len(meta_fields)), dtype=object)
+    for i, doi in enumerate(list(uniques) + [None]):  # missing DOIs have code -1
+        data = metas.get(doi, ({}, ""))[0]
+        for j, (field, default) in enumerate(meta_fields.values()):
+            val = data.get(field, default)
+            values[i, j] = ", ".join(val) if isinstance(val, list) else str(val)
+    return {col: values[codes, j] for j, col in enumerate(meta_fields)}
+
+def meta_sha1_column(dois, metas):
+    """sha1 of each row's metadata file as read by load_metas ("" without a file)"""
+    return np.array([metas[doi][1] if isinstance(doi, str) and doi in metas else "" for doi in dois], dtype=object)
+
+def preprocess_rows(start, stop):
+    """Link lists, anchor HTML and meta_* fields of work rows [start, stop)"""
+    rows = work.iloc[start:stop]
+    out = {}
+    out['code_links'], out['code_disp'] = parse_link_column(rows['code_link'])
+    out['data_links'], out['data_disp'] = parse_link_column(rows['links_to_the_data_repository'])
+    metas = load_metas(rows['doi'].unique().tolist())
+    out.update(extract_meta_fields(rows['doi'], metas))
+    out['meta_sha1'] = meta_sha1_column(rows['doi'], metas)
+    return out
+
+if n_processes > 1 or args.low_memory:
+    # Sharded preprocessing: spread over the worker processes, and/or one block
+    # of rows at a time under --low-memory so only one block's parsed metadata
+    # files are held at once
+    shards = map_shards(preprocess_rows, len(work), args.chunk_rows if args.low_memory else None)
+    preprocessed = {col: np.concatenate([sh[col] for sh in shards]) for col in shards[0]}
+    del shards
+    end_stage("preprocess", rows=len(work))
+else:
+    preprocessed = {}
+    preprocessed['code_links'], preprocessed['code_disp'] = parse_link_column(work['code_link'])
+    preprocessed['data_links'], preprocessed['data_disp'] = parse_link_column(work['links_to_the_data_repository'])
+    end_stage("list_parse", rows=len(work))
+    # Pre-load metadata to avoid repeated IO
+    meta_cache = load_metas(work['doi'].unique().tolist())
+    end_stage("meta_load", rows=len(meta_cache))
+    preprocessed.update(extract_meta_fields(work['doi'], meta_cache))
+    preprocessed['meta_sha1'] = meta_sha1_column(work['doi'], meta_cache)
+    del meta_cache
+    end_stage("meta_fields", rows=len(work))
+
+if changed_dois:
+    # sha1 of the metadata files whose stat changed, from the bytes read above
+    loaded = dict(zip(work['doi'], preprocessed['meta_sha1']))
+    for doi in changed_dois:
+        doi_digest[doi] = meta_files[meta_filename(doi)][2] = loaded.get(doi, "")
+    row_key = row_keys(doi_digest)
+
+def str_column(col):
+    """Column -> object ndarray of strings, with "" for missing values"""
+    return col.astype(str).where(col.notna(), "").to_numpy(dtype=object)
+
+# Paper columns are extracted once for the rebuilt rows and merged with the
+# cached records of all other rows. Preprocessed columns are object arrays of
+# strings already; only the ones straight from the CSV need converting.
+work_columns = [preprocessed[col] if col in preprocessed else str_column(work[col]) for col in [*csv_fields.values(), *meta_fields]]
+paper_records = np.empty((len(df), len(paper_fields)), dtype=object)
+for i, col in enumerate(work_columns):
+    paper_records[dirty, i] = col
+for pos in np.flatnonzero(~dirty):
+    paper_records[pos] = cached_papers[int(row_key[pos])]
+papers = {field: paper_records[:, i].tolist() for i, field in enumerate(paper_fields)}
+end_stage("paper_table", rows=len(df))
+
+word_re = re.compile(r"\w+")
+
+def index_terms(fields, start, stop):
+    """term -> ascending ids of the papers in [start, stop) whose fields contain it"""
+    columns = [paper_records[start:stop, paper_fields.index(field)] for field in fields]
+    index = {}
+    # ids are visited in increasing order, so every posting list comes out sorted
+    for paper_id, values in enumerate(zip(*columns), start):
+        for term in set(word_re.findall(" ".join(map(str, values)).lower())):
+            index.setdefault(term, []).append(paper_id)
+    return index
+
+def build_search_index(fields):
+    """Inverted index over the given paper fields: sorted terms, each with a delta-encoded sorted list of paper ids"""
+    index = {}
+    # Shards cover consecutive id ranges in order, so appending keeps the lists sorted
+    for shard in map_shards(functools.partial(index_terms, fields), len(paper_records)):
+        for term, ids in shard.items():
+            index.setdefault(term, []).extend(ids)
+    terms = sorted(index)
+    postings = []
+    for term in terms:
+        ids = index[term]
+        postings.append([ids[0]] + [b - a for a, b in zip(ids, ids[1:])])
+    return {"fields": fields, "terms": terms, "postings": postings}
+
+search_index = build_search_index(index_fields)
+end_stage("search_index", rows=len(search_index["terms"]))
+
+# Similar papers: the --similar nearest neighbours of every paper in the t-SNE
+# plane (or --embedding-column), stored as an n x k table of paper ids padded
+# with -1. Uses scipy's KD-tree when installed, else a chunked brute-force search.
+def parse_embedding(cell):
+    """One vector list literal -> 1-d float array, None when missing or malformed"""
+    if not isinstance(cell, str) or not cell.strip():
+        return None
+    try:
+        vector = np.asarray(ast.literal_eval(cell.strip()), dtype=float)
+    except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+        return None
+    return vector if vector.ndim == 1 else None
+
+def parse_embeddings(col):
+    """Column of vector list literals -> float matrix, NaN rows where missing, malformed or not of the most common length"""
+    rows = [parse_embedding(v) for v in col]
+    lengths = Counter(len(r) for r in rows if r is not None)
+    dim = lengths.most_common(1)[0][0] if lengths else 0
+    vectors = np.full((len(rows), dim), np.nan)
+    for i, r in enumerate(rows):
+        if r is not None and len(r) == dim:
+            vectors[i] = r
+    return vectors
+
+def nearest_neighbours(points, queries, k):
+    """Positions in points of the k nearest points to each query, nearest first"""
+    if cKDTree is not None:
+        _, nearest = cKDTree(points).query(queries, k=k, workers=-1)
+        return nearest.reshape(len(queries), k)
+    nearest = np.empty((len(queries), k), dtype=np.int64)
+    sq_points = (points ** 2).sum(axis=1)
+    chunk = max(1, 2 ** 24 // len(points))  # ~128 MB of distances per chunk
+    for start in range(0, len(queries), chunk):
+        q = queries[start:start + chunk]
+        dist = sq_points[None, :] - 2 * q @ points.T
+        part = np.argpartition(dist, k - 1, axis=1)[:, :k] if k < len(points) else np.tile(np.arange(len(points)), (len(q), 1))
+        order = np.argsort(np.take_along_axis(dist, part, axis=1), axis=1, kind="stable")
+        nearest[start:start + len(q)] = np.take_along_axis(part, order, axis=1)
+    return nearest
+
+similar_label = {"any": "Similar papers", "code": "Similar papers with code", "data": "Similar papers with data"}[args.similar_filter]
+similar = None
+if args.similar > 0:
+    if args.embedding_column:
+        vectors = parse_embeddings(df[args.embedding_column])
+    else:
+        vectors = df[['tsne_x', 'tsne_y']].to_numpy(dtype=float)
+    valid = np.isfinite(vectors).all(axis=1) & (vectors.shape[1] > 0)
+    pool = valid & (df[dict(views)[args.similar_filter]].to_numpy(dtype=bool) if args.similar_filter != "any" else True)
+    candidates = np.flatnonzero(pool)
+    queries = np.flatnonzero(valid)
+    similar = np.full((len(df), args.similar), -1, dtype=np.int32)
+    # two extra neighbours: the paper itself and a possible duplicate row of it
+    k = min(args.similar + 2, len(candidates))
+    if k and len(queries):
+        nearest = candidates[nearest_neighbours(vectors[candidates], vectors[queries], k)]
+        doi = df['doi'].to_numpy(dtype=object)
+        for q, row in zip(queries.tolist(), nearest.tolist()):
+            row = [j for j in row if j != q and doi[j] != doi[q]][:args.similar]
+            similar[q, :len(row)] = row
+    end_stage("similar", rows=len(queries))
+
+# Lazy details: long fields only shown in the detail modal move out of the page
+# into shard files keyed by paper id (bucket: id modulo the shard count), so
+# papers without a DOI URL or sharing one keep their own entry, and the page
+# fetches a shard on first click.
+detail_fields = ["abstract", "keywords", "funding", "ack"]
+lazy_details = None
+detail_files = {}
+
+if args.lazy_details:
+    n_shards = max(args.detail_shards, 1)
+    details_dir = Path(args.out).parent / (Path(args.out).stem + "_details")
+    shards = [{} for _ in range(n_shards)]
+    for pid, values in enumerate(zip(*[papers.pop(f) for f in detail_fields])):
+        shards[pid % n_shards][pid] = list(values)
+    detail_files = {details_dir / f"{i}.json": json.dumps(entries, sort_keys=True) for i, entries in enumerate(shards)}
+    lazy_details = {"dir": details_dir.name + "/", "shards": n_shards, "fields": detail_fields}
+    end_stage("lazy_details", rows=n_shards, output_bytes=sum(map(len, detail_files.values())))
 
 # Build traces: 2 sets (Code View, Data View)
 traces = []
 
 # Helper to build traces for a specific view
-def add_view_traces(view_name, flag_col, link_col, link_disp_idx):
+def add_view_traces(view_name, flag_col):
+    # One grouping pass yields the row positions of every (topic, flag) group
+    groups = df.groupby([topic_values, df[flag_col]], sort=False, observed=True).indices
     for t in topics:
-        sub = df[df[topic_col].fillna("Unknown") == t]
         for flag in [True, False]:
-            g = sub[sub[flag_col] == flag]
-            if g.empty:
+            idx = groups.get((t, flag))
+            if idx is None:
                 continue
-            
-            x = g['tsne_x'].astype(float).tolist()
-            y = g['tsne_y'].astype(float).tolist()
-            doi = g['doi'].apply(safe_str).tolist()
-            doi_url = g['doi_url'].apply(safe_str).tolist()
-            year = g['year'].apply(safe_str).tolist()
-            journal = g['journal'].apply(safe_str).tolist()
-            
-            # Metadata fields
-            def short_title(title):
-              if pd.isna(title):
-                return ""
-              words = str(title).split()
-              if len(words) > 10:
-                return " ".join(words[:10]) + "..."
-              return str(title)
-            meta_title = g['meta_title'].apply(short_title).tolist()
-            meta_full_title = g['meta_title'].tolist()
-            meta_abstract = g['meta_abstract'].tolist()
-            meta_inst = g['meta_inst'].tolist()
-            meta_keywords = g['meta_keywords'].tolist()
-            meta_funding = g['meta_funding'].tolist()
-            meta_ack = g['meta_ack'].tolist()
-            meta_open_access = g['meta_open_access'].tolist()
-            
-            # Precompute display strings for both code and data
-            code_links_list = g['code_links'].tolist()
-            data_links_list = g['data_links'].tolist()
-            
-            code_disp_list = []
-            for links in code_links_list:
-                if not links:
-                    code_disp_list.append("No link found")
-                else:
-                    anchors = [f"<a href='{u}' target='_blank' rel='noopener noreferrer'>{u}</a>" for u in links[:3]]
-                    code_disp_list.append("<br>".join(anchors))
-            
-            data_disp_list = []
-            for links in data_links_list:
-                if not links:
-                    data_disp_list.append("No link found")
-                else:
-                    anchors = [f"<a href='{u}' target='_blank' rel='noopener noreferrer'>{u}</a>" for u in links[:3]]
-                    data_disp_list.append("<br>".join(anchors))
 
             color = topic_color[t]
             
@@ -182,7 +725,7 @@ def add_view_traces(view_name, flag_col, link_col, link_disp_idx):
                 name = t + f" (no {view_name})"
                 showlegend = False
 
-            # Hover template
+            # Hover template (customdata rows are expanded from the paper table in the page)
             hovertemplate = (
                 "<b>%{text}</b><br>"
                 f"Topic: {t}<br>"
@@ -198,11 +741,11 @@ def add_view_traces(view_name, flag_col, link_col, link_disp_idx):
                 "mode": "markers",
                 "name": name,
                 "showlegend": showlegend,
-                "x": x,
-                "y": y,
-                "text": meta_title,
-                # customdata: [doi_url, year, journal, code_disp, data_disp, title, abstract, inst, keywords, funding, ack, open_access]
-                "customdata": list(map(list, zip(doi_url, year, journal, code_disp_list, data_disp_list, meta_full_title, meta_abstract, meta_inst, meta_keywords, meta_funding, meta_ack, meta_open_access))),
+                # numpy arrays, converted to lists only while being serialized
+                "x": point_x[idx],
+                "y": point_y[idx],
+                # customdata: paper ids (row positions in the paper table)
+                "customdata": idx,
                 "hovertemplate": hovertemplate,
                 "hoverlabel": {"bgcolor": "#f3f4f6", "bordercolor": "#d1d5db", "font": {"color": "#111827"}} if flag else {},
                 "marker": marker,
@@ -212,14 +755,265 @@ def add_view_traces(view_name, flag_col, link_col, link_disp_idx):
             }
             traces.append(trace)
 
-# Generate traces for Code View
-add_view_traces("code", "is_code_publicly_available", "code_links", 3)
-# Generate traces for Data View
-add_view_traces("data", "is_data_repository_available", "data_links", 4)
+point_x = df['tsne_x'].to_numpy(dtype=float)
+point_y = df['tsne_y'].to_numpy(dtype=float)
+for view_name, flag_col in views:
+    add_view_traces(view_name, flag_col)
+    end_stage(f"traces_{view_name}", rows=len(df))
+
+# Random walk pools: ids of papers with code (data) available, overall and per topic
+walk_index = {}
+for view_name, flag_col in views:
+    available = np.flatnonzero(df[flag_col].to_numpy(dtype=bool))
+    by_topic = pd.Series(available).groupby(topic_values.to_numpy()[available]).indices
+    walk_index[view_name] = {"All": available.tolist(), **{t: available[pos].tolist() for t, pos in by_topic.items()}}
+end_stage("walk_index", rows=sum(len(pool["All"]) for pool in walk_index.values()))
+
+# Level of detail: per-trace point counts on square grids over the t-SNE extent,
+# from --lod-grid cells per axis halving down to 32. Cell ids are row * size + col.
+lod = None
+if args.lod_points and len(df) > args.lod_points:
+    grid = args.lod_grid
+    if grid < 1 or grid & (grid - 1):
+        raise SystemExit("--lod-grid must be a power of two")
+    finite = np.isfinite(point_x) & np.isfinite(point_y)
+    x0, x1 = point_x[finite].min(), point_x[finite].max()
+    y0, y1 = point_y[finite].min(), point_y[finite].max()
+    x1, y1 = max(x1, x0 + 1e-9), max(y1, y0 + 1e-9)
+    # finest-level column/row of every point, -1 for missing coordinates
+    col = np.where(finite, np.clip(np.floor((np.nan_to_num(point_x) - x0) / (x1 - x0) * grid), 0, grid - 1), -1).astype(np.int64)
+    row = np.where(finite, np.clip(np.floor((np.nan_to_num(point_y) - y0) / (y1 - y0) * grid), 0, grid - 1), -1).astype(np.int64)
+    sizes = [grid >> k for k in range(grid.bit_length()) if grid >> k >= 32][::-1] or [grid]
+    counts = []
+    for size in sizes:
+        shift = (grid // size).bit_length() - 1
+        cell = (row >> shift) * size + (col >> shift)
+        level = []
+        for tr in traces:
+            ids = np.asarray(tr["customdata"], dtype=np.int64)
+            cells, n = np.unique(cell[ids[finite[ids]]], return_counts=True)
+            level.append([cells.tolist(), n.tolist()])
+        counts.append(level)
+    lod = {"points": args.lod_points, "bounds": [float(x0), float(x1), float(y0), float(y1)], "sizes": sizes, "counts": counts}
+    end_stage("lod_grid", rows=int(finite.sum()))
+
+# Binary encoding (--binary): numeric arrays become {dtype, bdata} typed array
+# specs (base64 of little-endian values, the form Plotly reads), and string paper
+# fields with many repeats become {values, codes} dictionaries.
+def b64_array(values, dtype):
+    """Typed array spec for values stored as dtype ("f4", "i4", "u2", ...)"""
+    data = np.ascontiguousarray(values, dtype=np.dtype("<" + dtype)).tobytes()
+    return {"dtype": dtype, "bdata": base64.b64encode(data).decode("ascii")}
+
+def encode_papers(columns):
+    """Paper table for the page: dictionary-encode string fields with at most half as many distinct values as rows"""
+    if not args.binary:
+        return columns
+    encoded = {}
+    for field, values in columns.items():
+        if not values or not all(isinstance(v, str) for v in values):
+            encoded[field] = values
+            continue
+        codes, uniques = pd.factorize(np.asarray(values, dtype=object))
+        if len(uniques) <= len(values) // 2:
+            dtype = "u1" if len(uniques) <= 1 << 8 else "u2" if len(uniques) <= 1 << 16 else "u4"
+            encoded[field] = {"values": uniques.tolist(), "codes": b64_array(codes, dtype)}
+        else:
+            encoded[field] = values
+    return encoded
+
+def encode_trace(tr):
+    """Trace for the page, with typed array coordinates and ids under --binary"""
+    if not args.binary:
+        return tr
+    return {**tr, "x": b64_array(tr["x"], "f4"), "y": b64_array(tr["y"], "f4"), "customdata": b64_array(tr["customdata"], "i4")}
+
+# Facets: a bit-packed set of paper ids per facet value (bit i = paper i), so the
+# filter worker combines any filters with bitwise AND/OR over whole words
+def bitset(mask):
+    """Boolean mask -> little-endian uint32 words as a typed array spec"""
+    words = np.zeros((len(mask) + 31) // 32 * 4, dtype=np.uint8)
+    packed = np.packbits(mask, bitorder="little")
+    words[:len(packed)] = packed
+    return b64_array(words.view("<u4"), "u4")
+
+facet_columns = {
+    "topic": topic_values.to_numpy(dtype=object),
+    "year": np.array(papers["year"], dtype=object),
+    "journal": np.array(papers["journal"], dtype=object),
+    "code": np.where(df[dict(views)["code"]].to_numpy(dtype=bool), "True", "False").astype(object),
+    "data": np.where(df[dict(views)["data"]].to_numpy(dtype=bool), "True", "False").astype(object),
+    "open_access": np.array(papers["open_access"], dtype=object),
+}
+facets = {}
+for name, col in facet_columns.items():
+    codes, values = pd.factorize(col, sort=True)
+    facets[name] = {"values": values.tolist(), "bits": [bitset(codes == k) for k in range(len(values))]}
+facet_values = {name: facet["values"] for name, facet in facets.items()}
+end_stage("facets", rows=sum(len(v) for v in facet_values.values()))
+
+# Aggregate cube: papers per topic x year x journal and how many of them have code,
+# data and open access. Embedded in the page, where the summary chart sums its cells
+# for the current filters instead of recounting points, and written next to it
+# (<out>_cube.json) for use outside the page.
+cube_path = Path(args.out).parent / (Path(args.out).stem + "_cube.json")
+cube_dims = {dim: pd.factorize(facet_columns[dim], sort=True) for dim in ["topic", "year", "journal"]}
+cube_rows = pd.DataFrame({dim: codes for dim, (codes, _) in cube_dims.items()})
+cube_rows["total"] = 1
+for name in ["code", "data", "open_access"]:
+    cube_rows[name] = (facet_columns[name] == "True").astype(np.int64)
+cube_cells = cube_rows.groupby(list(cube_dims), sort=True).sum().reset_index()
+cube_file = json.dumps({"dims": {dim: values.tolist() for dim, (_, values) in cube_dims.items()},
+                        "cells": {col: cube_cells[col].tolist() for col in cube_cells.columns}})
+cube_json = cube_file.replace("</", "<\\/")  # embedded as a JSON data block
+del cube_rows, cube_cells
+end_stage("cube", rows=len(df), output_bytes=len(cube_file))
+
+# Tiles: with --tiles, coordinates and the paper table move out of the page into
+# a quadtree over the t-SNE plane written as static files. Leaves hold at most
+# --tile-points papers; the page fetches the leaves its viewport intersects.
+tiles = None
+tile_files = {}
+view_names = [v for v, _ in views]
+if args.tiles or args.serve is not None:
+    # trace index of every paper in each view
+    point_trace = np.full((len(views), len(df)), -1, dtype=np.int64)
+    for i, tr in enumerate(traces):
+        point_trace[view_names.index(tr["meta"]["view"]), tr["customdata"]] = i
+    finite = np.isfinite(point_x) & np.isfinite(point_y)
+    bounds = [float(point_x[finite].min()), float(point_x[finite].max()),
+              float(point_y[finite].min()), float(point_y[finite].max())] if finite.any() else [0.0, 1.0, 0.0, 1.0]
+    # object arrays, so a page of papers is picked by fancy indexing
+    paper_columns = {f: pd.Series(values, dtype=object).to_numpy() for f, values in papers.items()}
+if args.tiles:
+    tiles_dir = Path(args.out).parent / (Path(args.out).stem + "_tiles")
+    leaves = []
+
+    def split_tile(key, ids, bbox, depth):
+        """Quadtree leaves (key, bbox, ids); quadrant digit = 2 * (y >= mid) + (x >= mid)"""
+        if len(ids) <= args.tile_points or depth >= 20:
+            leaves.append((key, bbox, ids))
+            return
+        x0, x1, y0, y1 = bbox
+        mx, my = (x0 + x1) / 2, (y0 + y1) / 2
+        right, top = point_x[ids] >= mx, point_y[ids] >= my
+        for q, mask in enumerate([~top & ~right, ~top & right, top & ~right, top & right]):
+            if mask.any():
+                sub = [mx, x1] if q & 1 else [x0, mx]
+                sub += [my, y1] if q & 2 else [y0, my]
+                split_tile(key + str(q), ids[mask], sub, depth + 1)
+
+    split_tile("t", np.flatnonzero(finite), bounds, 0)
+    if not finite.all():
+        leaves.append(("none", None, np.flatnonzero(~finite)))  # no coordinates: details only, never drawn
+    paper_tile = np.empty(len(df), dtype=np.int64)
+    for leaf, (key, bbox, ids) in enumerate(leaves):
+        paper_tile[ids] = leaf
+    for leaf, (key, bbox, ids) in enumerate(leaves):
+        x, y = (point_x[ids], point_y[ids]) if bbox else (point_x[:0], point_y[:0])
+        tile_files[tiles_dir / f"{key}.json"] = json.dumps({
+            "ids": b64_array(ids, "i4") if args.binary else ids.tolist(),
+            "x": b64_array(x, "f4") if args.binary else x.tolist(),
+            "y": b64_array(y, "f4") if args.binary else y.tolist(),
+            # per view: trace index of each paper
+            "trace": [b64_array(t, "i4") if args.binary else t.tolist() for t in point_trace[:, ids]],
+            "papers": encode_papers({f: col[ids].tolist() for f, col in paper_columns.items()}),
+            "similar": b64_array(similar[ids], "i4") if similar is not None else None,
+            # leaf of each neighbour, so the page can load a similar paper without a global lookup
+            "similarTile": b64_array(np.where(similar[ids] >= 0, paper_tile[similar[ids]], -1), "i4") if similar is not None else None,
+        })
+    # Search index shards keyed by the first one or two characters of the terms; the
+    # filter worker fetches the shards a query needs (file name: hex of the UTF-8 prefix)
+    index_shards = {}
+    for term, postings in zip(search_index["terms"], search_index["postings"]):
+        shard = index_shards.setdefault(term[:2], {"terms": [], "postings": []})
+        shard["terms"].append(term)
+        shard["postings"].append(postings)
+    for prefix, shard in index_shards.items():
+        tile_files[tiles_dir / f"index-{prefix.encode('utf-8').hex()}.json"] = json.dumps(shard)
+    # Random walk weights: per leaf, papers of each trace with code (data) available
+    flagged = np.array([tr["meta"]["flag"] is True for tr in traces] + [False])
+    walk_counts = []
+    for key, bbox, ids in leaves:
+        in_pool = point_trace[:, ids][flagged[point_trace[:, ids]]]
+        walk_counts.append(np.column_stack(np.unique(in_pool, return_counts=True)).tolist())
+    tiles = {"dir": tiles_dir.name + "/", "cap": max(args.tile_cache, 1), "bounds": bounds,
+             "papers": len(df), "fields": list(papers), "views": view_names, "indexPrefixes": sorted(index_shards),
+             "leaves": [[key, bbox, len(ids), counts] for (key, bbox, ids), counts in zip(leaves, walk_counts)]}
+    for tr in traces:
+        tr["x"], tr["y"], tr["customdata"] = [], [], []
+    end_stage("tiles", rows=len(leaves), output_bytes=sum(map(len, tile_files.values())))
+
+# Query server: with --serve the page carries no points, paper table, search or
+# walk index; it asks the server started after the build, which filters the
+# in-memory table (see serve_explorer below)
+api = None
+if args.serve is not None:
+    api = {"points": "api/points", "paper": "api/paper/", "random": "api/random", "bounds": bounds,
+           "papers": len(df), "fields": list(papers), "pageSize": max(args.page_size, 1)}
+    for tr in traces:
+        tr["x"], tr["y"], tr["customdata"] = [], [], []
+
+def json_default(obj):
+    """json.dumps hook for numpy arrays and scalars"""
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"{type(obj).__name__} is not JSON serializable")
+
+def iter_json(obj, chunk=10000):
+    """json.dumps(obj) in pieces: containers are split and long lists encoded chunk items at a time"""
+    if isinstance(obj, dict):
+        yield "{"
+        for i, (key, value) in enumerate(obj.items()):
+            yield (", " if i else "") + json.dumps(str(key)) + ": "
+            yield from iter_json(value, chunk)
+        yield "}"
+    elif isinstance(obj, (list, np.ndarray)) and len(obj) and (len(obj) > chunk or isinstance(obj[0], dict)):
+        step = 1 if isinstance(obj[0], dict) else chunk
+        yield "["
+        for start in range(0, len(obj), step):
+            if step == 1:
+                yield ", " if start else ""
+                yield from iter_json(obj[start], chunk)
+            else:
+                yield (", " if start else "") + json.dumps(obj[start:start + step], default=json_default)[1:-1]
+        yield "]"
+    else:
+        yield json.dumps(obj, default=json_default)
+
+page_traces = [encode_trace(tr) for tr in traces]
+page_papers = None if tiles or api else encode_papers(papers)
+# Page payloads. With --low-memory they are not serialized here: the template gets a
+# placeholder for each and write_page() encodes them into the output file.
+# With tiles or the query server, the search index, walk pools and facet bitsets
+# (all linear in the corpus) stay out of the page.
+inline = not (api or tiles)
+payloads = {"traces": page_traces, "papers": page_papers, "tiles": tiles, "walk_index": walk_index if inline else None,
+            "lod": lod, "search_index": search_index if inline else None, "facets": facets if inline else None}
+if args.low_memory:
+    traces_json, papers_json, tiles_json, walk_index_json, lod_json, search_index_json, facets_json = (f"\0{name}\0" for name in payloads)
+else:
+    traces_json = json.dumps(page_traces, default=json_default)
+    papers_json = json.dumps(page_papers)
+    tiles_json = json.dumps(tiles)
+    walk_index_json = json.dumps(payloads["walk_index"])
+    lod_json = json.dumps(lod)
+    # Embedded as a JSON data block that only the filter worker parses
+    search_index_json = json.dumps(payloads["search_index"]).replace("</", "<\\/")
+    facets_json = json.dumps(payloads["facets"]).replace("</", "<\\/")
+    end_stage("json_serialize", output_bytes=sum(map(len, [traces_json, papers_json, walk_index_json, search_index_json, lod_json, tiles_json, facets_json])))
+# Neighbour table; with tiles or the query server its rows arrive with the papers instead
+similar_json = json.dumps(None if similar is None else
+                          {"k": similar.shape[1], "ids": None if tiles or api else b64_array(similar, "i4")})
 
 topic_options = ["All"] + topics
 code_options = ["All", "Code available", "No code"]
 data_options = ["All", "Data available", "No data"]
+year_options = ["All"] + [y for y in facet_values["year"] if y]
+journal_options = ["All"] + [j for j in facet_values["journal"] if j]
+open_access_options = ["All", "Open access", "Not open access"]
 
 html = f"""<!doctype html>
 <html lang="en">
@@ -532,6 +1326,29 @@ html = f"""<!doctype html>
             {''.join([f'<option value="{d}">{d}</option>' for d in data_options])}
           </select>
         </div>
+        <div class="control">
+          <label for="yearFrom">Year</label>
+          <div style="display: flex; gap: 8px; width: 100%;">
+            <select id="yearFrom" aria-label="From year">
+              {''.join([f'<option value="{y}">{"From" if y == "All" else y}</option>' for y in year_options])}
+            </select>
+            <select id="yearTo" aria-label="To year">
+              {''.join([f'<option value="{y}">{"To" if y == "All" else y}</option>' for y in year_options])}
+            </select>
+          </div>
+        </div>
+        <div class="control">
+          <label for="journalSelect">Journal</label>
+          <select id="journalSelect">
+            {''.join([f'<option value="{html_escape(j)}">{html_escape(j)}</option>' for j in journal_options])}
+          </select>
+        </div>
+        <div class="control">
+          <label for="openAccessSelect">Open Access</label>
+          <select id="openAccessSelect">
+            {''.join([f'<option value="{o}">{o}</option>' for o in open_access_options])}
+          </select>
+        </div>
         <div class="control">
           <label for="searchInput">Search abstract (beta)</label>
           <input type="text" id="searchInput" placeholder="e.g., calibration" />
@@ -540,6 +1357,11 @@ html = f"""<!doctype html>
           <button id="btnRandomWalk" class="btn" style="width: 100%; justify-content: center; background-color: #059669; border: none; cursor: pointer;">🎲 Random Walk</button>
           <div class="sub" style="margin-top: 4px; font-size: 12px;">Discover a random paper with open data or code.</div>
         </div>
+        <div class="control">
+          <label>Open science by year</label>
+          <div class="sub" id="summaryText" style="margin-top: 0; font-size: 12px;"></div>
+          <div id="summaryPlot" style="width: 100%; height: 200px;"></div>
+        </div>
       </div>
       <div class="footer" style="flex-direction: column; margin-top: auto;">
         <div>
@@ -592,8 +1414,666 @@ html = f"""<!doctype html>
     </div>
   </div>
 
+  <script type="application/json" id="searchIndexData">{search_index_json}</script>
+  <script type="application/json" id="facetData">{facets_json}</script>
+  <script type="application/json" id="cubeData">{cube_json}</script>
+  <script type="text/js-worker" id="filterWorkerSrc">
+    // Filter/search worker. Inverted index: sorted terms and delta-encoded posting lists of paper ids
+    let searchIndex = null;
+    let nPapers = 0;
+    let traceInfo = [];
+    let lodSize = 0; // finest density grid size, 0 without level of detail
+    let facets = null; // facet name -> {{values, bits}}: one bit-packed set of paper ids per value
+    let walkPools = null; // view -> topic -> paper ids of the random walk
+    // Tiles: the index comes in shards fetched on demand, keyed by term prefix, and only
+    // the drawn points are searched and filtered
+    let indexBase = null;
+    let indexPrefixes = [];
+    const indexShards = new Map(); // prefix -> {{terms, postings}}, or a pending fetch
+    const decodedPostings = new Map();
+    let pending = null;
+
+    function postings(k) {{
+      if (!decodedPostings.has(k)) {{
+        const deltas = searchIndex.postings[k];
+        const ids = new Int32Array(deltas.length);
+        let id = 0;
+        for (let i = 0; i < deltas.length; i++) {{
+          id += deltas[i];
+          ids[i] = id;
+        }}
+        decodedPostings.set(k, ids);
+      }}
+      return decodedPostings.get(k);
+    }}
+
+    function lowerBound(terms, word) {{
+      let lo = 0, hi = terms.length;
+      while (lo < hi) {{
+        const mid = (lo + hi) >> 1;
+        if (terms[mid] < word) lo = mid + 1; else hi = mid;
+      }}
+      return lo;
+    }}
+
+    function queryWords(query) {{
+      return query.toLowerCase().match(/[\p{{L}}\p{{N}}_]+/gu) || [];
+    }}
+
+    function shardPrefixes(word) {{
+      // shards that can hold terms starting with word (prefixes are the terms' first 1-2 characters)
+      const chars = Array.from(word);
+      if (chars.length >= 2) return [chars.slice(0, 2).join("")];
+      return indexPrefixes.filter(p => p.startsWith(word));
+    }}
+
+    function loadShards(query) {{
+      const hex = p => Array.from(new TextEncoder().encode(p), b => b.toString(16).padStart(2, "0")).join("");
+      const wanted = queryWords(query).flatMap(shardPrefixes).filter(p => indexPrefixes.includes(p));
+      return Promise.all(wanted.map(p => {{
+        if (!indexShards.has(p)) {{
+          indexShards.set(p, fetch(indexBase + "index-" + hex(p) + ".json")
+            .then(r => r.ok ? r.json() : null)
+            .catch(() => null)
+            .then(shard => {{ indexShards.set(p, shard || {{terms: [], postings: []}}); }}));
+        }}
+        return indexShards.get(p);
+      }}));
+    }}
+
+    function shardHits(query) {{
+      // tiles: set of drawn papers containing every query word as a term prefix
+      let hits = new Set(traceInfo.flatMap(tr => Array.from(tr.ids)));
+      queryWords(query).forEach(word => {{
+        const found = new Set();
+        shardPrefixes(word).forEach(p => {{
+          const shard = indexShards.get(p);
+          if (!shard || !shard.terms) return;
+          for (let k = lowerBound(shard.terms, word); k < shard.terms.length && shard.terms[k].startsWith(word); k++) {{
+            let id = 0;
+            shard.postings[k].forEach(delta => {{
+              id += delta;
+              if (hits.has(id)) found.add(id);
+            }});
+          }}
+        }});
+        hits = found;
+      }});
+      return hits;
+    }}
+
+    function pointKept(tr, i, selected) {{
+      // tiles: facet filters checked on the drawn point's own values instead of bitsets over all papers
+      for (const name in selected) {{
+        const value = name === "topic" ? tr.topic : (name === "code" || name === "data") ? (tr.flag ? "True" : "False") : tr.values[name][i];
+        if (!selected[name].includes(value)) return false;
+      }}
+      return true;
+    }}
+
+    function searchMask(query) {{
+      // 1 for papers containing every query word as a term prefix, else 0
+      const words = queryWords(query);
+      const mask = new Uint8Array(nPapers).fill(1);
+      words.forEach(word => {{
+        const hit = new Uint8Array(nPapers);
+        const terms = searchIndex.terms;
+        for (let k = lowerBound(terms, word); k < terms.length && terms[k].startsWith(word); k++) {{
+          const ids = postings(k);
+          for (let i = 0; i < ids.length; i++) hit[ids[i]] = 1;
+        }}
+        for (let i = 0; i < nPapers; i++) mask[i] &= hit[i];
+      }});
+      return mask;
+    }}
+
+    function facetBits(name, k) {{
+      // bitsets are decoded from base64 the first time a value is filtered on
+      const facet = facets[name];
+      if (!(facet.bits[k] instanceof Uint32Array)) {{
+        const bytes = Uint8Array.from(atob(facet.bits[k].bdata), c => c.charCodeAt(0));
+        facet.bits[k] = new Uint32Array(bytes.buffer);
+      }}
+      return facet.bits[k];
+    }}
+
+    function facetMask(selected) {{
+      // AND over the filtered facets of the OR of their selected values; null when nothing is filtered
+      let mask = null;
+      Object.entries(selected).forEach(([name, values]) => {{
+        const facet = facets[name];
+        const any = new Uint32Array((nPapers + 31) >>> 5);
+        values.forEach(value => {{
+          const k = facet.values.indexOf(value);
+          if (k < 0) return;
+          const bits = facetBits(name, k);
+          for (let w = 0; w < any.length; w++) any[w] |= bits[w];
+        }});
+        if (!mask) mask = any;
+        else for (let w = 0; w < mask.length; w++) mask[w] &= any[w];
+      }});
+      return mask;
+    }}
+
+    function evaluate(q) {{
+      const hits = !q.search ? null : indexBase ? shardHits(q.search) : searchMask(q.search);
+      const isHit = hits instanceof Set ? id => hits.has(id) : id => hits[id] === 1;
+      const mask = (facets && q.facets) ? facetMask(q.facets) : null;
+      const pointFacets = (indexBase && q.facets && Object.keys(q.facets).length) ? q.facets : null;
+      const vis = [];
+      const opacity = [];
+      const keep = []; // per trace: 1 for points the facets keep, null when all are kept
+      // finest-grid counts of the matching and of the drawn points, for the density view
+      const density = ((hits || mask) && lodSize) ? new Float32Array(lodSize * lodSize) : null;
+      const drawn = (mask && lodSize) ? new Float32Array(lodSize * lodSize) : null;
+
+      traceInfo.forEach(tr => {{
+        // 1. Check View
+        let visible = (tr.view === q.view);
+
+        // 2. Check Topic
+        if (visible) {{
+          const okTopic = (q.topic === "All") || (tr.topic === q.topic);
+          if (!okTopic) visible = false;
+        }}
+
+        // 3. Check Filter based on View
+        if (visible) {{
+          const choice = (q.view === "code") ? q.code : q.data;
+          if (choice === "All") {{
+              // keep visible
+          }} else if ((choice === "Code available" || choice === "Data available") && tr.flag === true) {{
+              // keep visible
+          }} else if ((choice === "No code" || choice === "No data") && tr.flag === false) {{
+              // keep visible
+          }} else {{
+              visible = false;
+          }}
+        }}
+
+        // 4. Facet filters: points outside the mask are hidden, and so is a trace left empty
+        let kept = null;
+        if (visible && (mask || pointFacets)) {{
+          kept = new Uint8Array(tr.ids.length);
+          let n = 0;
+          for (let i = 0; i < kept.length; i++) {{
+            const id = tr.ids[i];
+            kept[i] = mask ? (mask[id >>> 5] >>> (id & 31)) & 1 : pointKept(tr, i, pointFacets) ? 1 : 0;
+            n += kept[i];
+          }}
+          if (n === 0) visible = false;
+          else if (n === kept.length) kept = null;
+        }}
+
+        vis.push(visible);
+        keep.push(visible ? kept : null);
+
+        // 5. Per-point opacity based on abstract search (null = all points fully shown)
+        if (!visible) {{
+          opacity.push(null);
+          return;
+        }}
+        const op = hits ? new Float32Array(tr.ids.length) : null;
+        if (op) {{
+          for (let i = 0; i < op.length; i++) op[i] = isHit(tr.ids[i]) ? 1 : 0.05;
+        }}
+        opacity.push(op);
+        if (density) {{
+          for (let i = 0; i < tr.ids.length; i++) {{
+            if (tr.cells[i] < 0 || (kept && !kept[i])) continue;
+            if (drawn) drawn[tr.cells[i]]++;
+            if (!hits || isHit(tr.ids[i])) density[tr.cells[i]]++;
+          }}
+        }}
+      }});
+      return {{vis, opacity, keep, density, drawn}};
+    }}
+
+    function walkPick(q) {{
+      // random paper of the view/topic pool that passes the facet filters, null if none does
+      const pool = (walkPools[q.view] || {{}})[q.topic] || new Int32Array(0);
+      const mask = (facets && q.facets) ? facetMask(q.facets) : null;
+      const kept = id => !mask || ((mask[id >>> 5] >>> (id & 31)) & 1) === 1;
+      // a few draws usually hit a kept paper; narrow facets fall back to filtering the pool
+      for (let tries = 0; tries < 32 && pool.length; tries++) {{
+        const id = pool[Math.floor(Math.random() * pool.length)];
+        if (kept(id)) return id;
+      }}
+      const ids = pool.filter(kept);
+      return ids.length ? ids[Math.floor(Math.random() * ids.length)] : null;
+    }}
+
+    async function run() {{
+      const q = pending;
+      pending = null;
+      if (indexBase && q.search) await loadShards(q.search);
+      const res = evaluate(q);
+      const buffers = res.opacity.concat(res.keep, [res.density, res.drawn]).filter(Boolean).map(a => a.buffer);
+      postMessage({{seq: q.seq, ...res}}, buffers);
+    }}
+
+    onmessage = (ev) => {{
+      const msg = ev.data;
+      if (msg.type === "init") {{
+        searchIndex = JSON.parse(msg.index);
+        facets = JSON.parse(msg.facets);
+        nPapers = msg.nPapers;
+        traceInfo = msg.traces;
+        lodSize = msg.lodSize;
+        walkPools = msg.walk;
+        indexBase = msg.indexBase;
+        indexPrefixes = msg.indexPrefixes || [];
+        return;
+      }}
+      if (msg.type === "walk") {{
+        postMessage({{type: "walk", id: walkPick(msg)}});
+        return;
+      }}
+      if (msg.type === "traces") {{
+        // points drawn per trace changed (tiles)
+        msg.ids.forEach((ids, i) => {{ traceInfo[i].ids = ids; traceInfo[i].values = msg.values[i]; }});
+        return;
+      }}
+      // Queries arriving before the scheduled run replace the pending one, so stale queries are dropped
+      const scheduled = pending !== null;
+      pending = msg;
+      if (!scheduled) setTimeout(run, 0);
+    }};
+  </script>
   <script>
-    const traces = {json.dumps(traces)};
+    const traces = {traces_json};
+    // Set when built with --tiles: points and paper fields are fetched per quadtree tile
+    const tiles = {tiles_json};
+    // Set when built with --serve: points and papers are queried from the local server
+    const api = {json.dumps(api)};
+    // Shared paper table (field -> values by paper id); traces reference papers by id.
+    // With tiles or the query server it starts empty and holds the fields fetched so far.
+    const papers = {papers_json} || Object.fromEntries((tiles || api).fields.map(f => [f, new Array((tiles || api).papers)]));
+    Object.keys(papers).forEach(f => {{ papers[f] = decodeColumn(papers[f]); }});
+    // Similar papers (--similar): flat n x k table of paper ids padded with -1. With tiles
+    // or the query server the rows arrive with the papers instead (paper id -> row).
+    const similarTable = {similar_json};
+    const similarIds = similarTable && decodeArray(similarTable.ids);
+    const similarRows = new Map();
+
+    function similarOf(id) {{
+      if (!similarTable) return [];
+      const k = similarTable.k;
+      const row = similarIds ? similarIds.subarray(id * k, id * k + k) : (similarRows.get(id) || []);
+      return Array.from(row).filter(nid => nid >= 0);
+    }}
+
+    function decodeArray(v) {{
+      // {{dtype, bdata}} typed array spec (--binary) -> typed array; plain lists pass through
+      if (!v || !v.bdata) return v;
+      const bytes = Uint8Array.from(atob(v.bdata), c => c.charCodeAt(0));
+      const Type = {{f4: Float32Array, f8: Float64Array, i1: Int8Array, u1: Uint8Array, i2: Int16Array,
+                    u2: Uint16Array, i4: Int32Array, u4: Uint32Array}}[v.dtype];
+      return new Type(bytes.buffer);
+    }}
+
+    function decodeColumn(col) {{
+      // dictionary-encoded paper field -> value per paper
+      return (col && col.codes) ? Array.from(decodeArray(col.codes), c => col.values[c]) : col;
+    }}
+    // Set when built with --lazy-details: detail fields live in shard files keyed by paper id
+    const lazyDetails = {json.dumps(lazy_details)};
+    const similarLabel = {json.dumps(similar_label)};
+    const loadedShards = new Map();
+    const pendingShards = new Map();
+
+    function detailShard(id) {{
+      // same bucketing as the generator: paper id modulo the shard count
+      return id % lazyDetails.shards;
+    }}
+
+    function loadShard(shard) {{
+      if (!pendingShards.has(shard)) {{
+        pendingShards.set(shard, fetch(lazyDetails.dir + shard + ".json")
+          .then(r => r.ok ? r.json() : {{}})
+          .catch(() => ({{}}))
+          .then(entries => {{ loadedShards.set(shard, entries); }}));
+      }}
+      return pendingShards.get(shard);
+    }}
+
+    function loadDetails(id) {{
+      if (!lazyDetails) return Promise.resolve();
+      return loadShard(detailShard(id));
+    }}
+
+    function detailField(id, field) {{
+      if (!lazyDetails) return papers[field][id];
+      const entries = loadedShards.get(detailShard(id));
+      const row = entries ? entries[id] : null;
+      return row ? row[lazyDetails.fields.indexOf(field)] : "";
+    }}
+
+    function shortTitle(title) {{
+      const words = (title || "").split(/\s+/).filter(Boolean);
+      return words.length > 10 ? words.slice(0, 10).join(" ") + "..." : (title || "");
+    }}
+
+    // Expand a trace's paper ids into the per-point hover fields
+    function setTracePapers(tr, ids) {{
+      tr.paperIds = ids;
+      tr.text = ids.map(id => shortTitle(papers.title[id]));
+      // customdata: [paper id, year, journal, code_disp, data_disp]
+      tr.customdata = ids.map(id => [id, papers.year[id], papers.journal[id], papers.code[id], papers.data[id]]);
+    }}
+    traces.forEach(tr => {{
+      tr.x = decodeArray(tr.x);
+      tr.y = decodeArray(tr.y);
+      setTracePapers(tr, Array.from(decodeArray(tr.customdata)));
+    }});
+
+    // What the filters currently show, so each result only restyles traces that changed
+    const shownVis = traces.map(tr => tr.visible);
+    const shownOpacity = traces.map(() => null); // null = fully opaque
+    const shownKeep = traces.map(() => null); // null = all points drawn
+
+    function sameOpacity(a, b) {{
+      if (a === b) return true;
+      if (!a || !b || a.length !== b.length) return false;
+      for (let i = 0; i < a.length; i++) {{
+        if (a[i] !== b[i]) return false;
+      }}
+      return true;
+    }}
+
+    // Level of detail: while more than lod.points points are in view, the point
+    // traces are swapped for a heatmap of the precomputed per-trace grid counts
+    const lod = {lod_json};
+    let lodActive = false;
+    let lodShown = null; // level and filter generation the heatmap was drawn for
+    let lodGeneration = 0;
+    let searchDensity = null; // finest-grid counts of matching points while a search or facet filter is active
+    let drawnDensity = null; // finest-grid counts of the points the facet filters keep
+    let finestCounts = null; // drawn points (search misses included) per finest cell
+    let plotDiv = null;
+
+    function plotVisible(i) {{
+      // legendonly keeps the topic legend while the density layer replaces the points
+      return shownVis[i] ? (lodActive ? "legendonly" : true) : false;
+    }}
+
+    function gridCounts(level, matching) {{
+      // cell counts at one grid level of the points the filters show (matching: only search hits)
+      const size = lod.sizes[level];
+      const z = new Float64Array(size * size);
+      const fine = (matching && searchDensity) ? searchDensity : drawnDensity;
+      if (fine) {{
+        const finest = lod.sizes[lod.sizes.length - 1];
+        const shift = lod.sizes.length - 1 - level;
+        for (let c = 0; c < fine.length; c++) {{
+          if (fine[c]) z[(Math.floor(c / finest) >> shift) * size + ((c % finest) >> shift)] += fine[c];
+        }}
+      }} else {{
+        traces.forEach((tr, i) => {{
+          if (!shownVis[i]) return;
+          const [cells, counts] = lod.counts[level][i];
+          for (let j = 0; j < cells.length; j++) z[cells[j]] += counts[j];
+        }});
+      }}
+      return z;
+    }}
+
+    function viewRange() {{
+      const [x0, x1, y0, y1] = (lod || tiles || api).bounds;
+      const layout = plotDiv && plotDiv.layout;
+      const xr = (layout && layout.xaxis && layout.xaxis.range) || [x0, x1];
+      const yr = (layout && layout.yaxis && layout.yaxis.range) || [y0, y1];
+      return {{xr: [Math.min(...xr), Math.max(...xr)], yr: [Math.min(...yr), Math.max(...yr)]}};
+    }}
+
+    function pointsInView() {{
+      // drawn points, counted over the finest cells the viewport touches
+      const [x0, x1, y0, y1] = lod.bounds;
+      const {{xr, yr}} = viewRange();
+      const finestLevel = lod.sizes.length - 1;
+      const finest = lod.sizes[finestLevel];
+      if (!finestCounts) finestCounts = gridCounts(finestLevel, false);
+      const cellOf = (v, lo, hi) => Math.min(finest - 1, Math.max(0, Math.floor((v - lo) / (hi - lo) * finest)));
+      const c0 = cellOf(xr[0], x0, x1), c1 = cellOf(xr[1], x0, x1);
+      const r0 = cellOf(yr[0], y0, y1), r1 = cellOf(yr[1], y0, y1);
+      let inView = 0;
+      for (let r = r0; r <= r1; r++) {{
+        for (let c = c0; c <= c1; c++) inView += finestCounts[r * finest + c];
+      }}
+      return inView;
+    }}
+
+    function updateLod() {{
+      if (!lod) return;
+      const [x0, x1, y0, y1] = lod.bounds;
+      const {{xr, yr}} = viewRange();
+      const finestLevel = lod.sizes.length - 1;
+      const active = pointsInView() > lod.points;
+      if (active !== lodActive) {{
+        lodActive = active;
+        const idx = traces.map((tr, i) => i);
+        Plotly.restyle("plot", {{"visible": idx.map(plotVisible)}}, idx);
+        Plotly.restyle("plot", {{"visible": active}}, [traces.length]);
+      }}
+      if (!active) return;
+
+      // coarsest level that still spans ~48 cells across the viewport
+      const frac = Math.min(1, (xr[1] - xr[0]) / (x1 - x0));
+      let level = lod.sizes.findIndex(size => size * frac >= 48);
+      if (level < 0) level = finestLevel;
+      if (lodShown && lodShown.level === level && lodShown.generation === lodGeneration) return;
+      lodShown = {{level, generation: lodGeneration}};
+
+      const size = lod.sizes[level];
+      const counts = gridCounts(level, true);
+      const centers = (lo, hi) => Array.from({{length: size}}, (_, k) => lo + (k + 0.5) * (hi - lo) / size);
+      const z = [];
+      for (let r = 0; r < size; r++) {{
+        const rowCounts = Array.from(counts.subarray(r * size, (r + 1) * size), n => n || null);
+        z.push(rowCounts);
+      }}
+      Plotly.restyle("plot", {{x: [centers(x0, x1)], y: [centers(y0, y1)], z: [z]}}, [traces.length]);
+    }}
+
+    // Tiles: the leaves intersecting the viewport are drawn; loaded tiles are kept
+    // in least-recently-used order up to tiles.cap
+    const tileCache = new Map(); // leaf index -> tile
+    const paperLeaf = new Map(); // leaf of the papers in loaded tiles and of their similar papers
+    const pendingTiles = new Map();
+    let tileSeq = 0;
+    let drawnTiles = null;
+
+    function loadTile(leaf) {{
+      if (tileCache.has(leaf)) {{
+        const tile = tileCache.get(leaf);
+        tileCache.delete(leaf); // re-insert as most recently used
+        tileCache.set(leaf, tile);
+        return Promise.resolve(tile);
+      }}
+      if (!pendingTiles.has(leaf)) {{
+        pendingTiles.set(leaf, fetch(tiles.dir + tiles.leaves[leaf][0] + ".json")
+          .then(r => r.ok ? r.json() : null)
+          .catch(() => null)
+          .then(tile => {{
+            pendingTiles.delete(leaf);
+            if (!tile) return null;
+            ["ids", "x", "y"].forEach(key => {{ tile[key] = decodeArray(tile[key]); }});
+            tile.trace = tile.trace.map(decodeArray);
+            tiles.fields.forEach(f => {{ tile.papers[f] = decodeColumn(tile.papers[f]); }});
+            const tileSimilar = decodeArray(tile.similar), similarTile = decodeArray(tile.similarTile);
+            tile.ids.forEach((id, k) => {{
+              tiles.fields.forEach(f => {{ papers[f][id] = tile.papers[f][k]; }});
+              paperLeaf.set(id, leaf);
+              if (tileSimilar) {{
+                const row = tileSimilar.slice(k * similarTable.k, (k + 1) * similarTable.k);
+                similarRows.set(id, row);
+                row.forEach((nid, j) => {{ if (nid >= 0) paperLeaf.set(nid, similarTile[k * similarTable.k + j]); }});
+              }}
+              const tr = traces[tile.trace[0][k]];
+              if (tr) paperTopic[id] = tr.meta.topic;
+            }});
+            tileCache.set(leaf, tile);
+            return tile;
+          }}));
+      }}
+      return pendingTiles.get(leaf);
+    }}
+
+    const serverPapers = new Set(); // ids whose full record came from the query server
+
+    function loadPaper(id) {{
+      // fields of a paper outside the loaded tiles (random walk, similar papers)
+      if (api) {{
+        if (serverPapers.has(id)) return Promise.resolve();
+        return fetch(api.paper + id)
+          .then(r => r.ok ? r.json() : null)
+          .catch(() => null)
+          .then(rec => {{
+            if (!rec) return;
+            api.fields.forEach(f => {{ papers[f][id] = rec[f]; }});
+            if (rec.similar) similarRows.set(id, rec.similar);
+            paperTopic[id] = rec.topic;
+            serverPapers.add(id);
+          }});
+      }}
+      return (tiles && paperLeaf.has(id)) ? loadTile(paperLeaf.get(id)) : Promise.resolve();
+    }}
+
+    function evictTiles(keep) {{
+      for (const [leaf, tile] of tileCache) {{
+        if (tileCache.size <= tiles.cap) break;
+        if (keep.has(leaf)) continue; // tiles in view stay, even above the cap
+        tileCache.delete(leaf);
+        tile.ids.forEach(id => {{
+          tiles.fields.forEach(f => {{ papers[f][id] = undefined; }});
+          similarRows.delete(id);
+        }});
+      }}
+    }}
+
+    function updateTiles() {{
+      if (!tiles || lodActive) return;
+      const seq = ++tileSeq;
+      const {{xr, yr}} = viewRange();
+      const inView = [];
+      tiles.leaves.forEach(([key, bbox], leaf) => {{
+        if (bbox && bbox[0] <= xr[1] && bbox[1] >= xr[0] && bbox[2] <= yr[1] && bbox[3] >= yr[0]) inView.push(leaf);
+      }});
+      Promise.all(inView.map(loadTile)).then(loaded => {{
+        if (seq !== tileSeq) return; // superseded by a newer viewport
+        evictTiles(new Set(inView));
+        const key = inView.join(",");
+        if (key === drawnTiles) return;
+        drawnTiles = key;
+
+        const ids = traces.map(() => []), xs = traces.map(() => []), ys = traces.map(() => []);
+        loaded.forEach(tile => {{
+          if (!tile) return;
+          tile.trace.forEach(viewTraces => viewTraces.forEach((i, k) => {{
+            if (i < 0) return;
+            ids[i].push(tile.ids[k]);
+            xs[i].push(tile.x[k]);
+            ys[i].push(tile.y[k]);
+          }}));
+        }});
+        traces.forEach((tr, i) => {{
+          setTracePapers(tr, ids[i]);
+          tr.x = xs[i];
+          tr.y = ys[i];
+        }});
+        const idx = traces.map((tr, i) => i);
+        Plotly.restyle("plot", {{
+          x: xs, y: ys, text: traces.map(tr => tr.text), customdata: traces.map(tr => tr.customdata)
+        }}, idx);
+        // the worker re-evaluates search opacity and facet filters for the new points
+        shownOpacity.fill(undefined);
+        shownKeep.fill(null);
+        // with each point its own facet field values, which the worker filters on instead of bitsets
+        const facetFields = Object.keys(facetValues).filter(f => f in papers);
+        filterWorker.postMessage({{
+          type: "traces",
+          ids: traces.map(tr => Int32Array.from(tr.paperIds)),
+          values: traces.map(tr => Object.fromEntries(facetFields.map(f => [f, tr.paperIds.map(id => papers[f][id])])))
+        }});
+        updateVisibility();
+      }});
+    }}
+
+    // Query server: filters and search are evaluated over the whole table by the
+    // server, which returns the matching points in the viewport a page at a time
+    let serverSeq = 0;
+
+    function queryServer() {{
+      if (!api) return;
+      const seq = ++serverSeq;
+      const {{xr, yr}} = viewRange();
+      const searchInput = document.getElementById("searchInput");
+      const params = new URLSearchParams({{
+        view: currentView,
+        topic: document.getElementById("topicSelect").value,
+        code: document.getElementById("codeSelect").value,
+        data: document.getElementById("dataSelect").value,
+        search: searchInput ? searchInput.value.trim().toLowerCase() : "",
+        facets: JSON.stringify(facetSelection()),
+        x0: xr[0], x1: xr[1], y0: yr[0], y1: yr[1],
+        // while the density grid is shown only the trace visibility is needed
+        limit: lodActive ? 0 : api.pageSize
+      }});
+      const ids = traces.map(() => []), xs = traces.map(() => []), ys = traces.map(() => []), ops = traces.map(() => []);
+      const fetchPage = offset => fetch(api.points + "?" + params + "&offset=" + offset)
+        .then(r => r.json())
+        .then(res => {{
+          if (seq !== serverSeq) return; // superseded by a newer query
+          res.ids.forEach((id, k) => {{
+            const i = res.trace[k];
+            ids[i].push(id);
+            xs[i].push(res.x[k]);
+            ys[i].push(res.y[k]);
+            if (res.hit) ops[i].push(res.hit[k] ? 1 : 0.05);
+            Object.keys(res.papers).forEach(f => {{ papers[f][id] = res.papers[f][k]; }});
+            paperTopic[id] = traces[i].meta.topic;
+          }});
+          traces.forEach((tr, i) => {{
+            setTracePapers(tr, ids[i].slice());
+            tr.x = xs[i].slice();
+            tr.y = ys[i].slice();
+          }});
+          const idx = traces.map((tr, i) => i);
+          Plotly.restyle("plot", {{
+            x: traces.map(tr => tr.x), y: traces.map(tr => tr.y),
+            text: traces.map(tr => tr.text), customdata: traces.map(tr => tr.customdata)
+          }}, idx);
+          applyFilterResult({{vis: res.vis, opacity: traces.map((tr, i) => (res.hit && res.vis[i]) ? Float32Array.from(ops[i]) : null)}});
+          updateLod();
+          const next = offset + res.ids.length;
+          if (res.ids.length && next < res.total && !lodActive) return fetchPage(next);
+        }});
+      fetchPage(0).catch(() => {{}});
+    }}
+
+    function updateView() {{
+      updateLod();
+      updateTiles();
+      queryServer();
+    }}
+
+    let viewTimer = null;
+    function scheduleViewUpdate() {{
+      clearTimeout(viewTimer);
+      viewTimer = setTimeout(updateView, 50);
+    }}
+
+    const plotTraces = lod ? traces.concat([{{
+      type: "heatmap", x: [], y: [], z: [], zsmooth: false, hoverongaps: false, showscale: false,
+      colorscale: [[0, "rgba(191,219,254,0.55)"], [1, "rgba(30,58,138,0.95)"]],
+      hovertemplate: "%{{z}} papers<extra></extra>", meta: {{lod: true}}, visible: false
+    }}]) : traces;
+    if (lod) {{
+      // pick the initial mode before the first draw, so a large corpus is never drawn point by point
+      lodActive = pointsInView() > lod.points;
+      traces.forEach((tr, i) => {{ tr.visible = plotVisible(i); }});
+      plotTraces[traces.length].visible = lodActive;
+    }}
     const layout = {{
       margin: {{l: 50, r: 22, t: 18, b: 45}},
       paper_bgcolor: "#ffffff",
@@ -661,23 +2141,28 @@ html = f"""<!doctype html>
       }}
     }}
 
-    function showDetails(pt) {{
-        const cd = pt.customdata;
-        // customdata: [doi_url, year, journal, code_disp, data_disp, title, abstract, inst, keywords]
-        const doiUrl = cd && cd[0] ? cd[0] : "#";
-        const year = cd && cd[1] ? cd[1] : "N/A";
-        const journal = cd && cd[2] ? cd[2] : "N/A";
-        const codeDisp = cd && cd[3] ? cd[3] : "No code link";
-        const dataDisp = cd && cd[4] ? cd[4] : "No data link";
-        const metaTitle = cd && cd[5] ? cd[5] : (pt.text || "No Title");
-        const metaAbstract = cd && cd[6] ? cd[6] : "No abstract available.";
-        const metaInst = cd && cd[7] ? cd[7] : "Unknown Institution";
-        const metaKeywords = cd && cd[8] ? cd[8] : "";
-        const metaFunding = cd && cd[9] ? cd[9] : "";
-        const metaAck = cd && cd[10] ? cd[10] : "";
-        const metaOpenAccess = cd && cd[11] ? cd[11] : "False";
+    function showDetails(id, topic) {{
+        loadPaper(id)
+          .then(() => Promise.all(similarOf(id).map(loadPaper)))
+          .then(() => loadDetails(id))
+          .then(() => renderDetails(id, topic || paperTopic[id]));
+    }}
+
+    function renderDetails(id, topic) {{
+        const doiUrl = papers.doi_url[id] || "#";
+        const year = papers.year[id] || "N/A";
+        const journal = papers.journal[id] || "N/A";
+        const codeDisp = papers.code[id] || "No code link";
+        const dataDisp = papers.data[id] || "No data link";
+        const metaTitle = papers.title[id] || "No Title";
+        const metaAbstract = detailField(id, "abstract") || "No abstract available.";
+        const metaInst = papers.inst[id] || "Unknown Institution";
+        const metaKeywords = detailField(id, "keywords") || "";
+        const metaFunding = detailField(id, "funding") || "";
+        const metaAck = detailField(id, "ack") || "";
+        const metaOpenAccess = papers.open_access[id] || "False";
         
-        const topic = (pt.data && pt.data.meta) ? pt.data.meta.topic : (pt.topic || "Unknown");
+        topic = topic || "Unknown";
 
         const modalTitle = document.getElementById("modalTitle");
         const modalBody = document.getElementById("modalBody");
@@ -701,6 +2186,16 @@ html = f"""<!doctype html>
         content += `<hr style="border: 0; border-top: 1px solid #e5e7eb; margin: 1rem 0;">`;
         content += `<p><strong>Code:</strong> ${{codeDisp}}</p>`;
         content += `<p><strong>Data:</strong> ${{dataDisp}}</p>`;
+
+        const similar = similarOf(id);
+        if (similar.length) {{
+            content += `<hr style="border: 0; border-top: 1px solid #e5e7eb; margin: 1rem 0;">`;
+            content += `<p><strong>${{similarLabel}}:</strong></p><ul>`;
+            similar.forEach(nid => {{
+                content += `<li><a href="#" onclick="showDetails(${{nid}}); return false;">${{shortTitle(papers.title[nid]) || "No Title"}}</a> (${{papers.year[nid] || "N/A"}})</li>`;
+            }});
+            content += `</ul>`;
+        }}
         
         modalBody.innerHTML = content;
 
@@ -714,111 +2209,236 @@ html = f"""<!doctype html>
         modal.style.display = "flex";
     }}
 
-    Plotly.newPlot("plot", traces, layout, config).then(gd => {{
+    Plotly.newPlot("plot", plotTraces, layout, config).then(gd => {{
+      plotDiv = gd;
       gd.on("plotly_click", (ev) => {{
         if (!ev || !ev.points || !ev.points.length) return;
-        showDetails(ev.points[0]);
+        const pt = ev.points[0];
+        if (pt.data.meta.lod) {{
+          // zoom in 4x around a density cell
+          const {{xr, yr}} = viewRange();
+          const w = (xr[1] - xr[0]) / 8, h = (yr[1] - yr[0]) / 8;
+          Plotly.relayout("plot", {{"xaxis.range": [pt.x - w, pt.x + w], "yaxis.range": [pt.y - h, pt.y + h]}});
+          return;
+        }}
+        showDetails(pt.customdata[0], pt.data.meta.topic);
       }});
+      if (lod || tiles || api) {{
+        gd.on("plotly_relayout", scheduleViewUpdate);
+        updateView();
+      }}
     }});
 
-    function randomWalk() {{
-      const candidates = [];
-      traces.forEach(tr => {{
-        if (tr.meta && tr.meta.flag === true) {{
-          for (let i = 0; i < tr.x.length; i++) {{
-            candidates.push({{
-              customdata: tr.customdata[i],
-              text: tr.text[i],
-              topic: tr.meta.topic,
-              data: tr
-            }});
-          }}
-        }}
-      }});
+    // Random walk pools per view and topic (ids of papers with code/data available)
+    const walkIndex = {walk_index_json};
+    const paperTopic = new Array(papers.doi_url.length);
+    traces.forEach(tr => tr.paperIds.forEach(id => {{ paperTopic[id] = tr.meta.topic; }}));
 
-      if (candidates.length > 0) {{
-        const randomPt = candidates[Math.floor(Math.random() * candidates.length)];
-        showDetails(randomPt);
+    function randomWalk() {{
+      const topic = document.getElementById("topicSelect").value;
+      if (api) {{
+        fetch(api.random + "?" + new URLSearchParams({{view: currentView, topic, facets: JSON.stringify(facetSelection())}}))
+          .then(r => r.json())
+          .then(res => {{ if (res.id !== null) showDetails(res.id); }})
+          .catch(() => {{}});
+        return;
+      }}
+      if (tiles) {{
+        tileWalk(topic, facetSelection());
+        return;
       }}
+      // the worker draws from the pool, skipping papers the year/journal/open access filters hide
+      filterWorker.postMessage({{type: "walk", view: currentView, topic, facets: facetSelection()}});
     }}
 
-    function updateVisibility() {{
-      const topic = document.getElementById("topicSelect").value;
-      const code = document.getElementById("codeSelect").value;
-      const data = document.getElementById("dataSelect").value;
-      const searchInput = document.getElementById("searchInput");
-      const searchTerm = searchInput ? searchInput.value.trim().toLowerCase() : "";
+    function tileWalk(topic, selected) {{
+      // tiles: draw leaves weighted by their papers in the view/topic pool, then a paper of
+      // the loaded tile that passes the facet filters; gives up after a few empty tiles
+      const inPool = i => traces[i].meta.view === currentView && traces[i].meta.flag === true && (topic === "All" || traces[i].meta.topic === topic);
+      const weights = tiles.leaves.map(leaf => leaf[3].reduce((n, [i, count]) => n + (inPool(i) ? count : 0), 0));
+      const view = tiles.views.indexOf(currentView);
+      const kept = (id, tr) => Object.entries(selected).every(([name, values]) => values.includes(
+        name === "topic" ? tr.meta.topic : (name === "code" || name === "data") ? (tr.meta.flag ? "True" : "False") : papers[name][id]));
+      const attempt = tries => {{
+        const total = weights.reduce((a, b) => a + b, 0);
+        if (!total || tries === 0) return;
+        let r = Math.random() * total, leaf = 0;
+        while (r >= weights[leaf]) r -= weights[leaf++];
+        weights[leaf] = 0; // not drawn again
+        loadTile(leaf).then(tile => {{
+          const ids = tile ? Array.from(tile.ids).filter((id, k) => {{
+            const i = tile.trace[view][k];
+            return i >= 0 && inPool(i) && kept(id, traces[i]);
+          }}) : [];
+          if (ids.length) showDetails(ids[Math.floor(Math.random() * ids.length)]);
+          else attempt(tries - 1);
+        }});
+      }};
+      attempt(16);
+    }}
 
-      const vis = [];
-      const markerOpacities = [];
-
-      function matchesSearch(text, term) {{
-        if (!term) return true;
-        const lowerText = (text || "").toLowerCase();
-        const words = term.split(/\s+/).filter(Boolean);
-        if (!words.length) return true;
-        // simple fuzzy-ish search: all words must appear (case-insensitive, partial match)
-        return words.every(w => lowerText.includes(w));
-      }}
+    function lodCells(tr) {{
+      // finest density cell of every point (-1: no coordinates), for search-filtered density
+      if (!lod) return null;
+      const [x0, x1, y0, y1] = lod.bounds;
+      const finest = lod.sizes[lod.sizes.length - 1];
+      const cellOf = (v, lo, hi) => Math.min(finest - 1, Math.max(0, Math.floor((v - lo) / (hi - lo) * finest)));
+      return Int32Array.from(tr.x, (x, i) => {{
+        const y = tr.y[i];
+        return (Number.isFinite(x) && Number.isFinite(y)) ? cellOf(y, y0, y1) * finest + cellOf(x, x0, x1) : -1;
+      }});
+    }}
 
-      traces.forEach(tr => {{
-        // 1. Check View
-        let visible = (tr.meta.view === currentView);
+    // Search and filter evaluation runs in a worker; only the newest query's result is applied
+    const workerSrc = document.getElementById("filterWorkerSrc").textContent;
+    const filterWorker = new Worker(URL.createObjectURL(new Blob([workerSrc], {{type: "text/javascript"}})));
+    filterWorker.postMessage({{
+      type: "init",
+      // the index is parsed inside the worker, never on the main thread
+      index: document.getElementById("searchIndexData").textContent,
+      facets: document.getElementById("facetData").textContent,
+      nPapers: papers.doi_url.length,
+      traces: traces.map(tr => ({{view: tr.meta.view, topic: tr.meta.topic, flag: tr.meta.flag, ids: Int32Array.from(tr.paperIds), cells: lodCells(tr)}})),
+      // with tiles the worker only sees drawn points, so search density is not counted
+      lodSize: (lod && !tiles) ? lod.sizes[lod.sizes.length - 1] : 0,
+      walk: walkIndex && Object.fromEntries(Object.entries(walkIndex).map(([view, pools]) =>
+        [view, Object.fromEntries(Object.entries(pools).map(([topic, ids]) => [topic, Int32Array.from(ids)]))])),
+      // with tiles the worker fetches index shards itself; a worker made from a blob needs absolute URLs
+      indexBase: tiles ? new URL(tiles.dir, location.href).href : null,
+      indexPrefixes: tiles ? tiles.indexPrefixes : []
+    }});
+    let querySeq = 0;
 
-        // 2. Check Topic
-        if (visible) {{
-          const okTopic = (topic === "All") || (tr.meta.topic === topic);
-          if (!okTopic) visible = false;
+    function applyFilterResult(res) {{
+      searchDensity = res.density || null;
+      drawnDensity = res.drawn || null;
+      finestCounts = null;
+      lodGeneration++;
+      const changed = new Set();
+      res.vis.forEach((visible, i) => {{
+        // a hidden trace keeps its opacity until it is shown again
+        const opacity = visible ? res.opacity[i] : shownOpacity[i];
+        if (visible === shownVis[i] && sameOpacity(opacity, shownOpacity[i])) return;
+        shownVis[i] = visible;
+        shownOpacity[i] = opacity;
+        changed.add(i);
+      }});
+      let moved = false;
+      (res.keep || []).forEach((keep, i) => {{
+        if (!res.vis[i] || sameOpacity(keep, shownKeep[i])) return;
+        shownKeep[i] = keep;
+        changed.add(i);
+        moved = true;
+      }});
+      if (changed.size) {{
+        // one combined restyle, i.e. one redraw, for just the changed traces
+        const idx = [...changed];
+        const update = {{
+          "visible": idx.map(plotVisible),
+          "marker.opacity": idx.map(i => shownOpacity[i] || 1)
+        }};
+        if (moved) {{
+          // points the facets filter out become NaN, so they are neither drawn nor hoverable
+          const hide = (values, keep) => keep ? Float64Array.from(values, (v, k) => keep[k] ? v : NaN) : values;
+          update.x = idx.map(i => hide(traces[i].x, shownKeep[i]));
+          update.y = idx.map(i => hide(traces[i].y, shownKeep[i]));
         }}
+        Plotly.restyle("plot", update, idx);
+      }}
+    }}
 
-        // 3. Check Filter based on View
-        if (visible) {{
-          if (currentView === "code") {{
-              if (code === "All") {{
-                  // keep visible
-              }} else if (code === "Code available" && tr.meta.flag === true) {{
-                  // keep visible
-              }} else if (code === "No code" && tr.meta.flag === false) {{
-                  // keep visible
-              }} else {{
-                  visible = false;
-              }}
-          }} else {{
-              if (data === "All") {{
-                  // keep visible
-              }} else if (data === "Data available" && tr.meta.flag === true) {{
-                  // keep visible
-              }} else if (data === "No data" && tr.meta.flag === false) {{
-                  // keep visible
-              }} else {{
-                  visible = false;
-              }}
-          }}
-        }}
+    // Summary chart: shares of papers with code, data and open access per year for the
+    // topic, journal and year filters, summed from the aggregate cube embedded in the page
+    const summaryMeasures = [["code", "Code", "#2563eb"], ["data", "Data", "#059669"], ["open_access", "Open access", "#9333ea"]];
+    const cube = JSON.parse(document.getElementById("cubeData").textContent);
 
-        vis.push(visible);
+    function updateSummary() {{
+      const value = id => document.getElementById(id).value;
+      const topic = value("topicSelect"), journal = value("journalSelect");
+      const from = value("yearFrom"), to = value("yearTo");
+      const {{dims, cells}} = cube;
+      const years = dims.year.filter(y => y && (from === "All" || Number(y) >= Number(from)) && (to === "All" || Number(y) <= Number(to)));
+      const yearPos = new Map(years.map((y, k) => [dims.year.indexOf(y), k]));
+      const topicCode = dims.topic.indexOf(topic), journalCode = dims.journal.indexOf(journal);
+      const sums = Object.fromEntries(["total", ...summaryMeasures.map(m => m[0])].map(m => [m, new Array(years.length).fill(0)]));
+      for (let c = 0; c < cells.total.length; c++) {{
+        if (topic !== "All" && cells.topic[c] !== topicCode) continue;
+        if (journal !== "All" && cells.journal[c] !== journalCode) continue;
+        const k = yearPos.get(cells.year[c]);
+        if (k === undefined) continue;
+        Object.keys(sums).forEach(m => {{ sums[m][k] += cells[m][c]; }});
+      }}
+      const total = sums.total.reduce((a, b) => a + b, 0);
+      const share = (n, d) => d ? n / d : null;
+      document.getElementById("summaryText").innerText = `${{total.toLocaleString()}} papers: ` + summaryMeasures.map(([m, name]) =>
+        `${{name.toLowerCase()}} ${{Math.round(100 * (share(sums[m].reduce((a, b) => a + b, 0), total) || 0))}}%`).join(", ");
+      Plotly.react("summaryPlot", summaryMeasures.map(([m, name, color]) => ({{
+        type: "scatter", mode: "lines+markers", name, x: years, y: sums[m].map((n, k) => share(n, sums.total[k])),
+        line: {{color, width: 2}}, marker: {{size: 4}}, hovertemplate: "%{{x}}: %{{y:.0%}}<extra>" + name + "</extra>"
+      }})), {{
+        margin: {{l: 36, r: 8, t: 28, b: 24}},
+        paper_bgcolor: "#ffffff",
+        plot_bgcolor: "#ffffff",
+        font: {{size: 10, family: "'Palatino Linotype', 'Book Antiqua', Palatino, 'Times New Roman', serif"}},
+        xaxis: {{type: "category", gridcolor: "rgba(0,0,0,0.06)"}},
+        yaxis: {{tickformat: ".0%", rangemode: "tozero", gridcolor: "rgba(0,0,0,0.06)"}},
+        legend: {{orientation: "h", y: 1.25, x: 0}},
+        showlegend: true
+      }}, {{displayModeBar: false, responsive: true}});
+    }}
 
-        // 4. Per-point opacity based on abstract search
-        if (!visible) {{
-          markerOpacities.push(1);
-          return;
-        }}
+    // Selected values per filtered facet, evaluated on the facet bitsets (or by the query server)
+    const facetValues = {json.dumps(facet_values)};
 
-        if (!searchTerm) {{
-          // no search term: show all points fully
-          markerOpacities.push(1);
-        }} else {{
-          const cd = tr.customdata || [];
-          const opacities = cd.map(row => {{
-            const abstract = row && row.length > 6 ? row[6] : "";
-            return matchesSearch(abstract, searchTerm) ? 1 : 0.05;
-          }});
-          markerOpacities.push(opacities);
-        }}
+    function facetSelection() {{
+      const value = id => document.getElementById(id).value;
+      const selected = {{}};
+      if (value("topicSelect") !== "All") selected.topic = [value("topicSelect")];
+      const choice = value(currentView === "code" ? "codeSelect" : "dataSelect");
+      if (choice !== "All") selected[currentView] = [(choice === "Code available" || choice === "Data available") ? "True" : "False"];
+      const from = value("yearFrom"), to = value("yearTo");
+      if (from !== "All" || to !== "All") {{
+        selected.year = facetValues.year.filter(y => y && (from === "All" || Number(y) >= Number(from)) && (to === "All" || Number(y) <= Number(to)));
+      }}
+      if (value("journalSelect") !== "All") selected.journal = [value("journalSelect")];
+      const openAccess = value("openAccessSelect");
+      if (openAccess !== "All") selected.open_access = facetValues.open_access.filter(v => (v === "True") === (openAccess === "Open access"));
+      return selected;
+    }}
+
+    filterWorker.onmessage = (ev) => {{
+      const res = ev.data;
+      if (res.type === "walk") {{
+        if (res.id !== null) showDetails(res.id);
+        return;
+      }}
+      if (res.seq !== querySeq) return; // superseded by a newer query
+      applyFilterResult(res);
+      updateView();
+    }};
+
+    function updateVisibility() {{
+      if (api) {{
+        queryServer();
+        return;
+      }}
+      const searchInput = document.getElementById("searchInput");
+      filterWorker.postMessage({{
+        type: "query",
+        seq: ++querySeq,
+        view: currentView,
+        topic: document.getElementById("topicSelect").value,
+        code: document.getElementById("codeSelect").value,
+        data: document.getElementById("dataSelect").value,
+        search: searchInput ? searchInput.value.trim().toLowerCase() : "",
+        facets: facetSelection()
       }});
+    }}
 
-      Plotly.restyle("plot", "visible", vis);
-      Plotly.restyle("plot", {{"marker.opacity": markerOpacities}});
+    let searchTimer = null;
+    function debouncedUpdateVisibility() {{
+      clearTimeout(searchTimer);
+      searchTimer = setTimeout(updateVisibility, 150);
     }}
 
     function setView(view) {{
@@ -842,12 +2462,324 @@ html = f"""<!doctype html>
     document.getElementById("topicSelect").addEventListener("change", updateVisibility);
     document.getElementById("codeSelect").addEventListener("change", updateVisibility);
     document.getElementById("dataSelect").addEventListener("change", updateVisibility);
-    document.getElementById("searchInput").addEventListener("input", updateVisibility);
+    ["yearFrom", "yearTo", "journalSelect", "openAccessSelect"].forEach(id => {{
+      document.getElementById(id).addEventListener("change", updateVisibility);
+    }});
+    ["topicSelect", "yearFrom", "yearTo", "journalSelect"].forEach(id => {{
+      document.getElementById(id).addEventListener("change", updateSummary);
+    }});
+    updateSummary();
+    document.getElementById("searchInput").addEventListener("input", debouncedUpdateVisibility);
   </script>
 </body>
 </html>
 """
 
-out_path = "explorer.html"
-Path(out_path).write_text(html, encoding="utf-8")
-out_path
\ No newline at end of file
+def write_if_changed(path, data):
+    """Write bytes unless the file already holds exactly them, so its mtime stays put"""
+    path = Path(path)
+    if path.exists() and path.stat().st_size == len(data) and path.read_bytes() == data:
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return True
+
+def iter_page(template):
+    """Text pieces of the page template, with each \\0name\\0 placeholder's payload streamed in"""
+    for i, part in enumerate(template.split("\0")):
+        if i % 2 == 0:
+            yield part
+            continue
+        pieces = iter_json(payloads[part])
+        if part in ("search_index", "facets"):
+            # Embedded in a JSON data block; no piece ends inside a string, so "</" never straddles two
+            pieces = (piece.replace("</", "<\\/") for piece in pieces)
+        yield from pieces
+
+def write_page(path, template):
+    """Write the page template, streaming each \\0name\\0 placeholder's payload; returns (changed, bytes)"""
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    digest, size = hashlib.sha1(), 0
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(tmp, "wb") as fh:
+        for piece in iter_page(template):
+            data = piece.encode("utf-8")
+            digest.update(data)
+            size += len(data)
+            fh.write(data)
+    if path.exists() and path.stat().st_size == size and hashlib.sha1(path.read_bytes()).digest() == digest.digest():
+        tmp.unlink()
+        return False, size
+    os.replace(tmp, path)
+    return True, size
+
+def size_entry(*parts):
+    """Raw and gzip-compressed byte size of the JSON/text parts taken together"""
+    data = ",".join(parts).encode("utf-8")
+    return {"raw": len(data), "gzip": len(gzip.compress(data, 6))}
+
+def parse_size(text):
+    text = text.strip()
+    scale = {"k": 1024, "m": 1024 ** 2, "g": 1024 ** 3}.get(text[-1:].lower(), 1)
+    return int(float(text[:-1] if scale > 1 else text) * scale)
+
+def size_breakdown():
+    """Payload sizes by section, by field within each section and by trace"""
+    sections = {"html": size_entry(html), "traces": size_entry(traces_json), "papers": size_entry(papers_json),
+                "search_index": size_entry(search_index_json), "walk_index": size_entry(walk_index_json),
+                "facets": size_entry(facets_json)}
+    if lod:
+        sections["lod"] = size_entry(lod_json)
+    if tiles:
+        sections["tiles"] = size_entry(tiles_json)
+        sections["tile_files"] = size_entry(*tile_files.values())
+    if detail_files:
+        sections["details"] = size_entry(*detail_files.values())
+    sections["cube"] = size_entry(cube_file)
+    if similar is not None:
+        sections["similar"] = size_entry(similar_json)
+    fields = {}
+    for key in sorted({k for tr in page_traces for k in tr}):
+        fields[f"traces.{key}"] = size_entry(*[json.dumps(tr[key], default=json_default) for tr in page_traces if key in tr])
+    for key, values in (page_papers or {}).items():
+        fields[f"papers.{key}"] = size_entry(json.dumps(values))
+    for key, values in (payloads["search_index"] or {}).items():
+        fields[f"search_index.{key}"] = size_entry(json.dumps(values))
+    by_trace = [dict(name=tr["name"], view=tr["meta"]["view"], points=len(tr["x"]), **size_entry(json.dumps(page_tr, default=json_default)))
+                for tr, page_tr in zip(traces, page_traces)]
+    return {"sections": sections, "fields": fields, "traces": by_trace}
+
+out_path = args.out
+
+# Size report / budget: checked before anything is written, so an over-budget page is never published
+if args.size_report or args.size_budget:
+    sizes = size_breakdown()
+    flat = {}
+    for name, entry in {**sizes["sections"], **sizes["fields"]}.items():
+        flat[name], flat[name + ".gz"] = entry["raw"], entry["gzip"]
+    budget = {}
+    for item in args.size_budget:
+        key, _, limit = item.partition("=")
+        if key not in flat:
+            raise SystemExit(f"unknown size budget key {key!r}; known keys: {', '.join(sorted(flat))}")
+        budget[key] = {"limit": parse_size(limit), "actual": flat[key], "ok": flat[key] <= parse_size(limit)}
+    sizes["budget"] = budget
+    print(f"{'payload':<28}{'raw':>14}{'gzip':>12}")
+    for name, entry in sorted({**sizes["sections"], **sizes["fields"]}.items(), key=lambda kv: -kv[1]["gzip"])[:15]:
+        print(f"{name:<28}{entry['raw']:>14,}{entry['gzip']:>12,}")
+    if args.size_report:
+        Path(args.size_report).write_text(json.dumps(sizes, indent=2), encoding="utf-8")
+    over = [f"{key}: {b['actual']:,} > {b['limit']:,} bytes" for key, b in budget.items() if not b["ok"]]
+    if over:
+        raise SystemExit("size budget exceeded, explorer not written:\n  " + "\n  ".join(over))
+    end_stage("size_report")
+
+if args.serve is not None:
+    # The API-only page is kept in memory for the server, so it never replaces the published page at --out
+    served_page = "".join(iter_page(html) if args.low_memory else [html]).encode("utf-8")
+    html_size = len(served_page)
+else:
+    if args.low_memory:
+        changed, html_size = write_page(out_path, html)
+    else:
+        html_bytes = html.encode("utf-8")
+        changed, html_size = write_if_changed(out_path, html_bytes), len(html_bytes)
+        del html_bytes
+    print(f"wrote {out_path}" if changed else f"{out_path} unchanged")
+
+if detail_files:
+    written = sum(write_if_changed(path, text.encode("utf-8")) for path, text in detail_files.items())
+    for stale in set(details_dir.glob("*.json")) - set(detail_files):
+        stale.unlink()
+    print(f"wrote {written} of {len(detail_files)} detail shards to {details_dir}")
+if tile_files:
+    written = sum(write_if_changed(path, text.encode("utf-8")) for path, text in tile_files.items())
+    for stale in set(tiles_dir.glob("*.json")) - set(tile_files):
+        stale.unlink()
+    print(f"wrote {written} of {len(tile_files)} tiles to {tiles_dir}")
+if write_if_changed(cube_path, cube_file.encode("utf-8")):
+    print(f"wrote {cube_path}")
+end_stage("html_write", output_bytes=html_size)
+
+if use_cache:
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path.write_text(json.dumps({"meta": manifest.get("meta", {}) if meta_pack_path else meta_files}), encoding="utf-8")
+    # Only records of current rows are kept, so removed papers drop out of the cache
+    if dirty.any() or len(cached_papers) != len(np.unique(row_key)):
+        if args.low_memory:
+            # Same JSON as below, encoded a block of records at a time
+            with open(papers_cache_path, "w", encoding="utf-8") as fh:
+                fh.write(json.dumps({"salt": build_salt, "fields": paper_fields})[:-1] + ', "rows": {')
+                for start in range(0, len(row_key), args.chunk_rows):
+                    block = slice(start, start + args.chunk_rows)
+                    rows = {str(int(k)): rec for k, rec in zip(row_key[block], paper_records[block].tolist())}
+                    fh.write((", " if start else "") + json.dumps(rows)[1:-1])
+                fh.write("}}")
+        else:
+            rows = {str(int(k)): rec for k, rec in zip(row_key, paper_records.tolist())}
+            papers_cache_path.write_text(json.dumps({"salt": build_salt, "fields": paper_fields, "rows": rows}), encoding="utf-8")
+end_stage("cache_write")
+
+if profiler:
+    profiler.disable()
+    profiler.dump_stats(args.profile)
+if args.report:
+    for entry in stage_log:
+        entry.pop("py_current_b", None)
+    report = {
+        "started": build_started,
+        "csv": csv_path,
+        "out": out_path,
+        "rows": len(df),
+        "rebuilt_rows": len(work),
+        "wall_s": round(time.perf_counter() - build_start, 4),
+        "cpu_s": round(time.process_time() - build_cpu, 4),
+        "peak_rss_mb": peak_rss_mb(),
+        "stages": stage_log,
+    }
+    Path(args.report).write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+def serve_explorer(host, port):
+    """Serve the page, its detail shards and the query API until interrupted"""
+    page_routes = {"/", "/" + Path(out_path).name}
+    static = {"/" + cube_path.name: cube_path.resolve()}
+    if detail_files:
+        static.update({f"/{details_dir.name}/{path.name}": path.resolve() for path in detail_files})
+    hover_fields = ["doi_url", "year", "journal", "code", "data", "title"]
+    trace_meta = [tr["meta"] for tr in traces]
+    paper_topic = topic_values.to_numpy(dtype=object)
+    walk_pools = {view: {t: np.asarray(ids, dtype=np.int64) for t, ids in pools.items()} for view, pools in walk_index.items()}
+    terms = search_index["terms"]
+    flag_choices = {"Code available": True, "Data available": True, "No code": False, "No data": False}
+    rng = np.random.default_rng()
+    results = OrderedDict()  # LRU of encoded query results
+    results_lock = threading.Lock()
+
+    @functools.lru_cache(maxsize=4096)
+    def term_ids(k):
+        return np.cumsum(search_index["postings"][k])
+
+    @functools.lru_cache(maxsize=64)
+    def search_hits(query):
+        """Papers containing every query word as a term prefix, like searchMask() in the filter worker"""
+        hits = np.ones(len(df), dtype=bool)
+        for word in word_re.findall(query.lower()):
+            hit = np.zeros(len(df), dtype=bool)
+            k = bisect.bisect_left(terms, word)
+            while k < len(terms) and terms[k].startswith(word):
+                hit[term_ids(k)] = True
+                k += 1
+            hits &= hit
+        return hits
+
+    def facet_mask(q):
+        """Papers passing the facet filters, as facetMask() in the filter worker: AND over facets of the selected values"""
+        selected = json.loads(q.get("facets") or "{}")
+        if not isinstance(selected, dict):
+            raise ValueError("facets must be an object of value lists")
+        mask = np.ones(len(df), dtype=bool)
+        for name, values in selected.items():
+            if name not in facet_columns:
+                raise ValueError(f"unknown facet {name!r}")
+            if not isinstance(values, list) or not all(isinstance(v, str) for v in values):
+                raise ValueError(f"facet {name!r} must be a list of strings")
+            mask &= np.isin(facet_columns[name], values)
+        return mask
+
+    def query_points(q):
+        """Trace visibility plus one page of the visible points in the viewport, ordered by paper id"""
+        view = q.get("view", "code")
+        choice = q.get("code" if view == "code" else "data", "All")
+        topic = q.get("topic", "All")
+        vis = np.array([m["view"] == view and topic in ("All", m["topic"]) and (choice == "All" or flag_choices.get(choice) == m["flag"])
+                        for m in trace_meta] + [False])  # trace index -1: not drawn in this view
+        trace_of = point_trace[view_names.index(view)] if view in view_names else np.full(len(df), -1)
+        x0, x1, y0, y1 = (float(q.get(key, default)) for key, default in zip(["x0", "x1", "y0", "y1"], bounds))
+        selected = vis[trace_of] & (point_x >= x0) & (point_x <= x1) & (point_y >= y0) & (point_y <= y1) & facet_mask(q)
+        ids = np.flatnonzero(selected)
+        offset = max(int(q.get("offset", 0)), 0)
+        page = ids[offset:offset + min(max(int(q.get("limit", args.page_size)), 0), args.page_size)]
+        result = {"vis": vis[:-1].tolist(), "total": len(ids), "offset": offset, "ids": page.tolist(),
+                  "x": point_x[page].tolist(), "y": point_y[page].tolist(), "trace": trace_of[page].tolist(),
+                  "papers": {f: paper_columns[f][page].tolist() for f in hover_fields}}
+        if q.get("search"):
+            result["hit"] = search_hits(q["search"])[page].astype(np.int8).tolist()
+        return result
+
+    def api_response(route, q):
+        if route == "points":
+            key = tuple(sorted(q.items()))
+            with results_lock:
+                if key in results:
+                    results.move_to_end(key)
+                    return results[key]
+            body = json.dumps(query_points(q)).encode("utf-8")
+            with results_lock:
+                results[key] = body
+                while len(results) > max(args.query_cache, 0):
+                    results.popitem(last=False)
+            return body
+        if route.startswith("paper/"):
+            pid = int(route[len("paper/"):])
+            if not 0 <= pid < len(df):
+                return None
+            record = {"topic": paper_topic[pid], **{f: paper_columns[f][pid] for f in paper_columns}}
+            if similar is not None:
+                record["similar"] = similar[pid].tolist()
+            return json.dumps(record).encode("utf-8")
+        if route == "random":
+            pool = walk_pools.get(q.get("view"), {}).get(q.get("topic", "All"), np.empty(0, dtype=np.int64))
+            pool = pool[facet_mask(q)[pool]]
+            return json.dumps({"id": int(rng.choice(pool)) if len(pool) else None}).encode("utf-8")
+        return None
+
+    def respond(target):
+        """(status, content type, body) for a GET request target"""
+        url = urlsplit(target)
+        path = unquote(url.path)
+        if path.startswith("/api/"):
+            q = {key: values[-1] for key, values in parse_qs(url.query).items()}
+            try:
+                body = api_response(path[len("/api/"):], q)
+            except (ValueError, TypeError, KeyError) as e:
+                return "400 Bad Request", "text/plain", str(e).encode("utf-8")
+            return ("200 OK", "application/json", body) if body is not None else ("404 Not Found", "text/plain", b"not found")
+        # only the page, its cube and detail shards are served, never the rest of its directory
+        if path in page_routes:
+            return "200 OK", "text/html; charset=utf-8", served_page
+        if path in static and static[path].is_file():
+            return "200 OK", "application/json", static[path].read_bytes()
+        return "404 Not Found", "text/plain", b"not found"
+
+    async def handle(reader, writer):
+        try:
+            request = (await reader.readline()).decode("latin-1").split()
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass  # headers are not needed
+            if len(request) != 3 or request[0] != "GET":
+                status, ctype, body = "405 Method Not Allowed", "text/plain", b"only GET is supported"
+            else:
+                # queries are numpy work; keep the event loop free for other connections
+                status, ctype, body = await asyncio.to_thread(respond, request[1])
+            writer.write(f"HTTP/1.1 {status}\r\nContent-Type: {ctype}\r\nContent-Length: {len(body)}\r\n"
+                         "Cache-Control: no-cache\r\nConnection: close\r\n\r\n".encode("latin-1") + body)
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def main():
+        server = await asyncio.start_server(handle, host, port)
+        print(f"serving the explorer at http://{host}:{server.sockets[0].getsockname()[1]}/ (Ctrl+C to stop)")
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
+
+if args.serve is not None:
+    serve_explorer(args.host, args.serve)
@@ -0,0 +1,65 @@
+import base64
+import json
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+SCRIPT = Path(__file__).resolve().parent.parent / "dash-all-search.py"
+
+
+def write_corpus(root, embeddings):
+    """Minimal dashboard.csv (one row per embedding cell) and an empty meta/ directory"""
+    n = len(embeddings)
+    (root / "data").mkdir()
+    (root / "meta").mkdir()
+    pd.DataFrame({
+        "doi": [f"10.1/x.{i}" for i in range(n)],
+        "doi_url": [f"https://doi.org/10.1/x.{i}" for i in range(n)],
+        "year": [2020] * n,
+        "journal": ["Journal"] * n,
+        "lda_topic": ["Topic"] * n,
+        "tsne_x": [float(i) for i in range(n)],
+        "tsne_y": [float(i) for i in range(n)],
+        "is_code_publicly_available": [True] * n,
+        "is_data_repository_available": [False] * n,
+        "code_link": ["['https://github.com/a/b']"] * n,
+        "links_to_the_data_repository": ["[]"] * n,
+        "emb": embeddings,
+    }).to_csv(root / "data" / "dashboard.csv", index=False)
+
+
+def similar_rows(html):
+    """Neighbour table embedded in the page, as one list of paper ids per paper"""
+    table = json.loads(re.search(r"const similarTable = (\{.*?\});", html).group(1))
+    ids = np.frombuffer(base64.b64decode(table["ids"]["bdata"]), dtype="<i4").reshape(-1, table["k"])
+    return [[j for j in row if j >= 0] for row in ids.tolist()]
+
+
+def test_malformed_embedding_cells_become_nan_rows(tmp_path):
+    write_corpus(tmp_path, [
+        "[0.0, 0.0]",
+        "[0.1, 0.0]",
+        "[nan, 0.1]",          # Python-style literal that json cannot read
+        "[0.2, oops",          # not a literal at all
+        "[[0.3, 0.0]]",        # nested, not a vector
+        "[5.0, 5.0, 5.0]",     # other length
+        "",
+        "[0.2, 0.0]",
+    ])
+    result = subprocess.run(
+        [sys.executable, str(SCRIPT), "--no-cache", "--embedding-column", "emb", "--similar", "2",
+         "--similar-filter", "any", "--out", "out.html"],
+        cwd=tmp_path, capture_output=True, text=True,
+    )
+    assert result.returncode == 0, result.stderr
+    rows = similar_rows((tmp_path / "out.html").read_text(encoding="utf-8"))
+    # rows with an unusable vector get no neighbours and are never suggested
+    for bad in (2, 3, 4, 5, 6):
+        assert rows[bad] == []
+        assert all(bad not in row for row in rows)
+    assert rows[0] == [1, 7]
+    assert rows[7] == [1, 0]